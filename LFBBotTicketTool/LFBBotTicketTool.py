@@ -5,9 +5,15 @@ Version: 1.0.0 - 100% Deutsch
 
 import asyncio
 import datetime
+import gzip
 import logging
-import re
-from typing import Optional, Dict, List, Union
+import shutil
+import sqlite3
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import Optional, Dict, List, Set, Tuple, Union
 
 import discord
 from discord import (
@@ -25,8 +31,29 @@ from discord import (
 )
 from redbot.core import Config, commands, checks
 from redbot.core.bot import Red
+from redbot.core.data_manager import cog_data_path
 from redbot.core.utils.chat_formatting import humanize_list
 
+from .admission import AdmissionLimiter
+from .archive import TicketArchive, segment_name, select_expired
+from .bulk import BULK_BATCH, BULK_CONCURRENCY, BulkFilter
+from .counter import CounterAllocator
+from .feedback import FeedbackStats, feedback_deltas, format_hist
+from .index import TicketIndex
+from .jobs import JobQueue
+from .logdispatch import LogDispatcher
+from .pool import ChannelPool
+from .scheduler import DeadlineScheduler
+from .search import SEARCH_PAGE_SIZE, fts_query, parse_search
+from .settings import GuildSettings
+from .shards import CategoryShards
+from .sla import SlaMetrics, format_seconds
+from .stats import HOUR, TicketStats, claim_deltas, close_deltas, create_deltas, parse_duration, parse_ts
+from .store import SQLiteTicketStore, TicketStore
+from .workqueue import PRIO_CLOSE, PRIO_CREATE, PRIO_NOTIFY, PRIORITY_NAMES, WorkScheduler
+from .transcript import HtmlTranscript, TranscriptCache, TranscriptWriter, format_fields, header_lines, message_fields, message_record
+from .workers import LoopLagMonitor, RenderPool
+
 log = logging.getLogger("red.lfbbottickettool")
 
 DEFAULT_GUILD = {
@@ -60,8 +87,41 @@ DEFAULT_GUILD = {
     "show_user_info": True,
     "ping_on_create": True,
     "ping_role": None,
+    "log_backlog": 200,
+    "retention_days": 30,
+    "pool_size": 0,
+    "pool_channels": [],
+    "overflow_categories": {},
 }
 
+# Sekunden zwischen zwei Schreibvorgängen der gesammelten Aktivitätszeiten
+ACTIVITY_FLUSH_SECONDS = 30
+# Nachrichten bzw. Sekunden zwischen zwei Fortschrittsanzeigen beim Transkript
+TRANSCRIPT_PROGRESS_EVERY = 1000
+TRANSCRIPT_PROGRESS_SECONDS = 5
+# Zeilen pro Schreibvorgang in den Transkript-Cache
+TRANSCRIPT_CACHE_BATCH = 500
+# Zeitlimit pro Schritt nach dem Anlegen des Ticket-Channels und Anzahl gemerkter Messwerte
+CREATE_STEP_TIMEOUT = 10
+CREATE_STEP_SAMPLES = 200
+# Ticket-Erstellungen pro Guild: sofort erlaubte Anzahl, Nachschub pro Sekunde, maximale Warteschlange
+ADMISSION_BURST = 5
+ADMISSION_RATE = 0.5
+ADMISSION_QUEUE = 20
+# Sekunden zwischen zwei Fortschrittsanzeigen bei Massenaktionen
+BULK_PROGRESS_SECONDS = 5
+# Präfix der custom_ids der Ticket-Steuerung (lfb_close, lfb_claim, lfb_transcript)
+CONTROL_PREFIX = "lfb_"
+# Sekunden zwischen zwei Archivierungsläufen und Tickets pro Archivierungsschritt
+COMPACTION_INTERVAL = 6 * 3600
+COMPACTION_BATCH = 500
+# Views, die beim Start am Stück registriert werden, bevor der Event-Loop wieder dran ist
+VIEW_REGISTER_BATCH = 50
+# Obergrenze für vorab angelegte Pool-Channels pro Guild
+POOL_MAX = 25
+# Discord meldet eine volle Kategorie als Formularfehler (50035) am Feld parent_id
+INVALID_FORM_BODY = 50035
+
 
 class TicketButton(ui.Button):
     def __init__(self, cog, category: str, emoji: str, label: str, style: ButtonStyle):
@@ -115,6 +175,16 @@ class TicketPanelDropdownView(ui.View):
         self.add_item(TicketSelectMenu(cog, categories))
 
 
+def category_full(e: discord.HTTPException) -> bool:
+    """True, wenn Discord die Kategorie wegen des Limits von 50 Channels abgelehnt hat."""
+    return e.code == INVALID_FORM_BODY and "parent_id" in e.text and "maximum number of channels" in e.text.lower()
+
+
+def panel_signature(categories: Dict, style: str) -> tuple:
+    """Panels mit gleichen aktiven Kategorien und gleichem Stil teilen sich eine persistente View."""
+    return style, tuple(sorted(n for n, c in categories.items() if c.get("enabled", True)))
+
+
 class CloseReasonModal(ui.Modal):
     def __init__(self, cog, channel_id: int):
         self.cog = cog
@@ -128,8 +198,9 @@ class CloseReasonModal(ui.Modal):
 
 
 class FeedbackModal(ui.Modal):
-    def __init__(self, cog, ticket_id: str, user_id: int):
+    def __init__(self, cog, guild_id: int, ticket_id: int, user_id: int):
         self.cog = cog
+        self.guild_id = guild_id
         self.ticket_id = ticket_id
         self.user_id = user_id
         super().__init__(title="Ticket-Feedback", timeout=300)
@@ -146,32 +217,34 @@ class FeedbackModal(ui.Modal):
         except ValueError:
             await interaction.response.send_message("❌ Bitte gib eine Zahl zwischen 1 und 5 an.", ephemeral=True)
             return
-        await self.cog.save_feedback(interaction, self.ticket_id, self.user_id, rating, self.comment.value)
+        await self.cog.save_feedback(interaction, self.guild_id, self.ticket_id, self.user_id, rating, self.comment.value)
 
 
 class TicketControlView(ui.View):
-    def __init__(self, cog, channel_id: int):
+    """Eine persistente View für alle Tickets, das Ticket ergibt sich aus dem Channel der Interaktion."""
+
+    def __init__(self, cog):
         super().__init__(timeout=None)
         self.cog = cog
-        self.channel_id = channel_id
 
-    @ui.button(label="Schließen", emoji="🔒", style=ButtonStyle.danger, custom_id="lfb_close")
+    @ui.button(label="Schließen", emoji="🔒", style=ButtonStyle.danger, custom_id=f"{CONTROL_PREFIX}close")
     async def close_btn(self, interaction: Interaction, button: ui.Button):
-        await interaction.response.send_modal(CloseReasonModal(self.cog, self.channel_id))
+        await self.cog.dispatch_control(interaction, button.custom_id)
 
-    @ui.button(label="Claim", emoji="✋", style=ButtonStyle.primary, custom_id="lfb_claim")
+    @ui.button(label="Claim", emoji="✋", style=ButtonStyle.primary, custom_id=f"{CONTROL_PREFIX}claim")
     async def claim_btn(self, interaction: Interaction, button: ui.Button):
-        await self.cog.claim_ticket(interaction, self.channel_id)
+        await self.cog.dispatch_control(interaction, button.custom_id)
 
-    @ui.button(label="Transkript", emoji="📝", style=ButtonStyle.secondary, custom_id="lfb_transcript")
+    @ui.button(label="Transkript", emoji="📝", style=ButtonStyle.secondary, custom_id=f"{CONTROL_PREFIX}transcript")
     async def transcript_btn(self, interaction: Interaction, button: ui.Button):
-        await self.cog.generate_transcript_cmd(interaction, self.channel_id)
+        await self.cog.dispatch_control(interaction, button.custom_id)
 
 
 class FeedbackView(ui.View):
-    def __init__(self, cog, ticket_id: str, user_id: int):
+    def __init__(self, cog, guild_id: int, ticket_id: int, user_id: int):
         super().__init__(timeout=3600)
         self.cog = cog
+        self.guild_id = guild_id
         self.ticket_id = ticket_id
         self.user_id = user_id
 
@@ -180,7 +253,7 @@ class FeedbackView(ui.View):
         if interaction.user.id != self.user_id:
             await interaction.response.send_message("❌ Nur der Ticket-Ersteller kann Feedback geben.", ephemeral=True)
             return
-        await interaction.response.send_modal(FeedbackModal(self.cog, self.ticket_id, self.user_id))
+        await interaction.response.send_modal(FeedbackModal(self.cog, self.guild_id, self.ticket_id, self.user_id))
 
     @ui.button(label="Später", style=ButtonStyle.secondary)
     async def later_btn(self, interaction: Interaction, button: ui.Button):
@@ -199,58 +272,379 @@ class LFBBotTicketTool(commands.Cog):
         self.config = Config.get_conf(self, identifier=9876543210, force_registration=True)
         self.config.register_guild(**DEFAULT_GUILD)
         self._task = None
+        self._index: Dict[int, TicketIndex] = {}
+        self.store: TicketStore = SQLiteTicketStore(cog_data_path(self) / "tickets.db")
+        self.deadlines = DeadlineScheduler()
+        self._settings: Dict[int, GuildSettings] = {}
+        self._settings_version = 0
+        self._dirty_activity: Dict[int, Dict[int, float]] = {}
+        self._flush_task = None
+        self._jobs_task = None
+        self._views_task = None
+        self._compact_task = None
+        self.archive = TicketArchive(cog_data_path(self) / "archive")
+        self.render = RenderPool()
+        self.lag = LoopLagMonitor()
+        self.control_view = TicketControlView(self)
+        self._bulk_runs: Dict[int, dict] = {}
+        self._bulk_tasks: Dict[int, asyncio.Task] = {}
+        self.transcripts = TranscriptCache(cog_data_path(self) / "transcripts")
+        self._step_times: Dict[str, deque] = {}
+        self.counters = CounterAllocator(self._reserve_numbers)
+        self.work = WorkScheduler()
+        self.jobs = JobQueue(self.store, {"delete_channel": self.job_delete_channel})
+        self.logs = LogDispatcher(self._resolve_log_channel, send=lambda ch, batch: self.work.run(PRIO_NOTIFY, "log", lambda: ch.send(embeds=batch)))
+        self._stats: Dict[int, TicketStats] = {}
+        self._stats_pruned_hour = 0
+        self._sla: Dict[int, SlaMetrics] = {}
+        self._feedback: Dict[int, FeedbackStats] = {}
+        self.admission = AdmissionLimiter(ADMISSION_RATE, ADMISSION_BURST, ADMISSION_QUEUE)
+        self._creating: Set[Tuple[int, int]] = set()
+        self.pool = ChannelPool(self._create_pool_channel, self._delete_pool_channel, self._persist_pool, self.bot.wait_until_red_ready)
+        self.shards = CategoryShards()
+        self._growing: Dict[int, asyncio.Task] = {}
 
     async def cog_load(self):
+        await self.store.open()
+        self.lag.start()
+        await self.migrate_tickets()
+        for gid, tickets in (await self.store.load_all()).items():
+            self.tindex(gid).load(tickets)
+        for gid, rows in (await self.store.load_stats()).items():
+            self.tstats(gid).apply(rows)
+        for gid in self._index.keys() - self._stats.keys():
+            await self.rebuild_stats(gid)
+        for gid, rows in (await self.store.load_sketches()).items():
+            self.tsla(gid).load(rows)
+        for gid, rows in (await self.store.load_feedback_stats()).items():
+            self.tfeedback(gid).apply(rows)
+        for gid, data in (await self.config.all_guilds()).items():
+            self.pool.load(gid, data.get("pool_channels", []))
+            self.shards.load(gid, {int(base): ids for base, ids in data.get("overflow_categories", {}).items()})
+            self._swap_settings(gid, data)
+        for gid, idx in self._index.items():
+            for tdata in idx:
+                self.schedule_auto_close(gid, tdata)
         self._task = asyncio.create_task(self.auto_close_loop())
-        await self.setup_views()
+        self._flush_task = asyncio.create_task(self.activity_flush_loop())
+        await self.jobs.load()
+        self._bulk_runs = await self.store.load_bulk_runs()
+        for gid, run in self._bulk_runs.items():
+            log.info(f"Unterbrochene Massenaktion ({run['kind']}) in Guild {gid}, fortsetzen mit ticketset bulkresume")
+        self._jobs_task = asyncio.create_task(self.jobs_loop())
+        self.bot.add_view(self.control_view)
+        self._views_task = asyncio.create_task(self.setup_views())
+        self._compact_task = asyncio.create_task(self.compaction_loop())
         log.info("LFBBotTicketTool geladen")
 
     async def cog_unload(self):
-        if self._task:
-            self._task.cancel()
+        for task in (self._task, self._flush_task, self._jobs_task, self._views_task, self._compact_task, *self._bulk_tasks.values(), *self._growing.values()):
+            if task:
+                task.cancel()
+        self.control_view.stop()
+        await self.flush_activity()
+        await self.logs.close()
+        await self.pool.close()
+        await self.jobs.close()
+        await self.work.close()
+        await self.counters.close()
+        await self.store.close()
+        self.lag.stop()
+        self.render.close()
         log.info("LFBBotTicketTool entladen")
 
+    async def migrate_tickets(self):
+        """Übernimmt einmalig die Tickets aus der Config in den Ticket-Speicher."""
+        for gid, data in (await self.config.all_guilds()).items():
+            tickets = data.get("tickets") or {}
+            if not tickets or await self.store.is_migrated(gid):
+                continue
+            await self.store.import_tickets(gid, [dict(t, channel_id=int(cid)) for cid, t in tickets.items()])
+            await self.config.guild_from_id(gid).tickets.clear()
+            log.info(f"{len(tickets)} Tickets von Guild {gid} migriert")
+
     async def setup_views(self):
+        """Registriert im Hintergrund eine persistente View pro unterschiedlicher Panel-Signatur."""
         await self.bot.wait_until_red_ready()
-        for guild in self.bot.guilds:
-            data = await self.config.guild(guild).all()
-            for pid, pdata in data.get("panels", {}).items():
-                cats = data.get("categories", {})
-                if pdata.get("style") == "dropdown":
-                    self.bot.add_view(TicketPanelDropdownView(self, cats))
-                else:
-                    self.bot.add_view(TicketPanelView(self, cats, data.get("button_style", "primary")))
-
-    async def auto_close_loop(self):
+        start = time.perf_counter()
+        views: Dict[tuple, Dict] = {}
+        panels = 0
+        for gid, data in (await self.config.all_guilds()).items():
+            if self.bot.get_guild(gid) is None:
+                continue
+            cats = data.get("categories", {})
+            for pdata in data.get("panels", {}).values():
+                panels += 1
+                style = "dropdown" if pdata.get("style") == "dropdown" else data.get("button_style", "primary")
+                views.setdefault(panel_signature(cats, style), cats)
+        for i, ((style, _), cats) in enumerate(views.items(), 1):
+            self.bot.add_view(TicketPanelDropdownView(self, cats) if style == "dropdown" else TicketPanelView(self, cats, style))
+            if i % VIEW_REGISTER_BATCH == 0:
+                await asyncio.sleep(0)
+        log.info(f"{len(views)} Panel-Views für {panels} Panels registriert ({(time.perf_counter() - start) * 1000:.0f} ms)")
+
+    async def _reserve_numbers(self, gid: int, n: int):
+        # ticket_counter aus der Config bleibt als Untergrenze für ältere Daten
+        return await self.store.reserve_numbers(gid, n, (await self.settings(gid)).ticket_counter)
+
+    # === EINSTELLUNGEN ===
+    def cached_settings(self, gid: int) -> GuildSettings:
+        """Aktueller Snapshot ohne Config-Zugriff, Standardwerte falls noch nicht geladen."""
+        st = self._settings.get(gid)
+        if st is None:
+            st = self._settings[gid] = GuildSettings.from_config(DEFAULT_GUILD)
+        return st
+
+    async def settings(self, guild: Union[discord.Guild, int]) -> GuildSettings:
+        gid = guild if isinstance(guild, int) else guild.id
+        st = self._settings.get(gid)
+        if st is None:
+            st = await self.reload_settings(gid)
+        return st
+
+    async def reload_settings(self, gid: int) -> GuildSettings:
+        return self._swap_settings(gid, await self.config.guild_from_id(gid).all())
+
+    def _swap_settings(self, gid: int, data: dict) -> GuildSettings:
+        self._settings_version += 1
+        old = self._settings.get(gid)
+        new = self._settings[gid] = GuildSettings.from_config(data, self._settings_version)
+        self.logs.set_backlog(gid, new.log_backlog)
+        self.pool.set_size(gid, new.pool_size)
+        if old is None or (old.auto_close_hours, old.auto_close_warning_hours) != (new.auto_close_hours, new.auto_close_warning_hours):
+            for tdata in self.tindex(gid):
+                self.schedule_auto_close(gid, tdata)
+        return new
+
+    async def cog_after_invoke(self, ctx):
+        # Jeder ticketset-Befehl kann die Config ändern: Snapshot neu laden und austauschen
+        if ctx.guild and ctx.command.qualified_name.startswith("ticketset"):
+            await self.reload_settings(ctx.guild.id)
+
+    # === STATISTIKEN ===
+    def tstats(self, gid: int) -> TicketStats:
+        st = self._stats.get(gid)
+        if st is None:
+            st = self._stats[gid] = TicketStats()
+        return st
+
+    async def record_stats(self, gid: int, deltas):
+        """Aktualisiert die Zähler im Speicher sofort und danach im Speicher-Backend."""
+        self.tstats(gid).apply(deltas)
+        await self.store.bump_stats(gid, deltas)
+        hour = int(time.time() // HOUR)
+        if hour != self._stats_pruned_hour:
+            self._stats_pruned_hour = hour
+            for g, st in list(self._stats.items()):
+                expired = st.expired_hours(time.time())
+                if expired:
+                    st.apply(expired)
+                    await self.store.bump_stats(g, expired)
+
+    async def rebuild_stats(self, gid: int):
+        tickets = await self.store.all_tickets(gid)
+        st = self._stats[gid] = await self.render.run(lambda: TicketStats.rebuild(tickets + list(self.archive.iter_guild(gid)), time.time()))
+        await self.store.replace_stats(gid, st.rows())
+
+    # === SLA ===
+    def tsla(self, gid: int) -> SlaMetrics:
+        sla = self._sla.get(gid)
+        if sla is None:
+            sla = self._sla[gid] = SlaMetrics()
+        return sla
+
+    async def record_sla(self, gid: int, metric: str, tdata: dict, end: float, staff_id: Optional[int]):
+        start = tdata.get("created_ts") or parse_ts(tdata.get("created_at"))
+        if start is None:
+            return
+        sla = self.tsla(gid)
+        keys = sla.add(metric, end - start, tdata.get("category"), staff_id)
+        await self.store.save_sketches(gid, [k + (sla.sketches[k].to_dict(),) for k in keys])
+
+    async def record_first_response(self, message: discord.Message, tdata: dict):
+        """Erste Nachricht eines Team-Mitglieds (Support- oder Admin-Rolle) im Ticket."""
+        gid, cid, ts = message.guild.id, message.channel.id, message.created_at.timestamp()
+        self.tindex(gid).update(cid, first_response_at=ts, first_responder=message.author.id)
+        await self.store.update(gid, cid, first_response_at=ts, first_responder=message.author.id)
+        await self.record_sla(gid, "first_response", tdata, ts, message.author.id)
+
+    def tindex(self, guild: Union[discord.Guild, int]) -> TicketIndex:
+        gid = guild if isinstance(guild, int) else guild.id
+        idx = self._index.get(gid)
+        if idx is None:
+            idx = self._index[gid] = TicketIndex()
+        return idx
+
+    # === ARCHIV ===
+    async def compaction_loop(self):
         await self.bot.wait_until_red_ready()
         while True:
-            try:
-                await self.check_auto_close()
-            except Exception as e:
-                log.error(f"Auto-Close Fehler: {e}")
-            await asyncio.sleep(3600)
-
-    async def check_auto_close(self):
-        for guild in self.bot.guilds:
-            data = await self.config.guild(guild).all()
-            hours = data.get("auto_close_hours", 72)
-            if hours == 0:
+            for gid in list(self._index):
+                try:
+                    await self.compact_guild(gid)
+                except Exception as e:
+                    log.error(f"Archivierung für Guild {gid} fehlgeschlagen: {e}")
+            await asyncio.sleep(COMPACTION_INTERVAL)
+
+    async def compact_guild(self, gid: int) -> int:
+        """Verschiebt geschlossene Tickets älter als ``retention_days`` ins Archiv, gibt die Anzahl zurück."""
+        days = self.cached_settings(gid).retention_days
+        if days <= 0:
+            return 0
+        cutoff = time.time() - days * 86400
+        idx = self.tindex(gid)
+        old = select_expired(idx, cutoff)
+        for i in range(0, len(old), COMPACTION_BATCH):
+            batch = [dict(t) for t in old[i : i + COMPACTION_BATCH]]
+            await self.render.run(self.archive.append, gid, batch)
+            await self.store.archive_tickets(gid, [(t["channel_id"], t.get("number"), t.get("user_id"), segment_name(t)) for t in batch])
+            for t in batch:
+                idx.remove(t["channel_id"])
+        if old:
+            log.info(f"{len(old)} Tickets von Guild {gid} archiviert")
+        return len(old)
+
+    # === AUTO-CLOSE ===
+    async def auto_close_loop(self):
+        await self.bot.wait_until_red_ready()
+        await self.seed_activity()
+        await self.deadlines.run(self.on_deadline)
+
+    def schedule_auto_close(self, gid: int, tdata: dict):
+        """Setzt die nächste Frist (Warnung oder Schließung) eines Tickets."""
+        key = (gid, tdata["channel_id"])
+        st = self.cached_settings(gid)
+        hours, warn = st.auto_close_hours, st.auto_close_warning_hours
+        last = tdata.get("last_activity")
+        if not hours or tdata.get("status") != "open" or last is None:
+            self.deadlines.cancel(key)
+            return
+        deadline = last + hours * 3600
+        warned = tdata.get("warned_at")
+        if warned and warned >= last:
+            # Nach einer Warnung bleibt dem User immer die volle Warnfrist
+            self.deadlines.set(key, max(deadline, warned + warn * 3600), "close")
+        elif 0 < warn < hours:
+            self.deadlines.set(key, deadline - warn * 3600, "warn")
+        else:
+            self.deadlines.set(key, deadline, "close")
+
+    async def seed_activity(self):
+        """Liest einmalig die letzte Nachricht von offenen Tickets ohne Aktivitätszeit."""
+        for gid, idx in list(self._index.items()):
+            guild = self.bot.get_guild(gid)
+            if not guild:
                 continue
-            for cid, tdata in data.get("tickets", {}).items():
-                if tdata.get("status") != "open":
-                    continue
-                channel = guild.get_channel(int(cid))
+            seeded = {}
+            for tdata in [t for t in idx if t.get("status") == "open" and t.get("last_activity") is None]:
+                cid = tdata["channel_id"]
+                channel = guild.get_channel(cid)
                 if not channel:
                     continue
-                last_msg = None
-                async for msg in channel.history(limit=1):
-                    last_msg = msg
-                    break
-                if not last_msg:
-                    continue
-                since = (datetime.datetime.now(datetime.timezone.utc) - last_msg.created_at).total_seconds() / 3600
-                if since >= hours:
-                    await self.do_auto_close(guild, int(cid), tdata)
+                ts = None
+                try:
+                    async for msg in channel.history(limit=1):
+                        ts = msg.created_at.timestamp()
+                except discord.HTTPException:
+                    pass
+                ts = ts or time.time()
+                idx.update(cid, last_activity=ts)
+                seeded[cid] = {"last_activity": ts}
+                self.schedule_auto_close(gid, tdata)
+            if seeded:
+                await self.store.update_many(gid, seeded)
+
+    async def on_deadline(self, key, stage):
+        gid, cid = key
+        guild = self.bot.get_guild(gid)
+        tdata = self.tindex(gid).get(cid)
+        if not guild or not tdata or tdata.get("status") != "open":
+            return
+        if stage == "warn":
+            self.tindex(gid).update(cid, warned_at=time.time())
+            self.schedule_auto_close(gid, tdata)
+            asyncio.create_task(self.do_auto_close_warning(guild, cid, tdata))
+        else:
+            asyncio.create_task(self.do_auto_close(guild, cid, tdata))
+
+    async def jobs_loop(self):
+        await self.bot.wait_until_red_ready()
+        await self.jobs.run()
+
+    async def activity_flush_loop(self):
+        while True:
+            await asyncio.sleep(ACTIVITY_FLUSH_SECONDS)
+            await self.flush_activity()
+
+    async def flush_activity(self):
+        dirty, self._dirty_activity = self._dirty_activity, {}
+        for gid, acts in dirty.items():
+            try:
+                await self.store.update_many(gid, {cid: {"last_activity": ts} for cid, ts in acts.items()})
+            except Exception as e:
+                log.error(f"Aktivität speichern fehlgeschlagen: {e}")
+
+    async def _invalidate_transcript(self, guild_id, channel_id, message_ids):
+        if guild_id is None or channel_id not in self.tindex(guild_id):
+            return
+        # Erst unter dem Lock prüfen: eine laufende Aktualisierung kann die Nachricht gerade übernommen haben
+        async with self.transcripts.lock(guild_id, channel_id):
+            last = self.transcripts.last_id(guild_id, channel_id)
+            if last and min(message_ids) <= last:
+                self.transcripts.invalidate(guild_id, channel_id)
+
+    @commands.Cog.listener()
+    async def on_raw_message_edit(self, payload: discord.RawMessageUpdateEvent):
+        # Link-Vorschauen kommen ebenfalls als Update, aber ohne edited_timestamp: Cache behalten
+        if not payload.data.get("edited_timestamp"):
+            return
+        await self._invalidate_transcript(payload.guild_id, payload.channel_id, [payload.message_id])
+
+    @commands.Cog.listener()
+    async def on_raw_message_delete(self, payload: discord.RawMessageDeleteEvent):
+        await self._invalidate_transcript(payload.guild_id, payload.channel_id, [payload.message_id])
+
+    @commands.Cog.listener()
+    async def on_raw_bulk_message_delete(self, payload: discord.RawBulkMessageDeleteEvent):
+        await self._invalidate_transcript(payload.guild_id, payload.channel_id, payload.message_ids)
+
+    @commands.Cog.listener()
+    async def on_message(self, message: discord.Message):
+        if not message.guild:
+            return
+        idx = self._index.get(message.guild.id)
+        tdata = idx.get(message.channel.id) if idx else None
+        if tdata is None or tdata.get("status") != "open":
+            return
+        if message.author.id == self.bot.user.id:
+            return
+        ts = message.created_at.timestamp()
+        tdata["last_activity"] = ts
+        self._dirty_activity.setdefault(message.guild.id, {})[message.channel.id] = ts
+        self.schedule_auto_close(message.guild.id, tdata)
+        if (
+            tdata.get("first_response_at") is None
+            and message.author.id != tdata.get("user_id")
+            and isinstance(message.author, Member)
+            and self.cached_settings(message.guild.id).is_staff(r.id for r in message.author.roles)
+        ):
+            await self.record_first_response(message, tdata)
+
+    async def do_auto_close_warning(self, guild, cid, tdata):
+        await self.store.update(guild.id, cid, warned_at=tdata["warned_at"])
+        channel = guild.get_channel(cid)
+        if not channel:
+            return
+        entry = self.deadlines.entry((guild.id, cid))
+        when = f"<t:{int(entry[0])}:R>" if entry else "Kürze"
+        user = guild.get_member(tdata.get("user_id"))
+        try:
+            await channel.send(
+                content=user.mention if user else None,
+                embed=Embed(title="⏰ Inaktivität", description=f"Dieses Ticket wird {when} wegen Inaktivität geschlossen.\nSchreibe eine Nachricht, um es offen zu halten.", color=Color.orange()),
+            )
+        except discord.HTTPException:
+            pass
 
     async def do_auto_close(self, guild, cid, tdata):
         channel = guild.get_channel(cid)
@@ -258,174 +652,615 @@ class LFBBotTicketTool(commands.Cog):
             return
         try:
             await channel.send(embed=Embed(title="🔒 Auto-Close", description="Ticket aufgrund von Inaktivität geschlossen.", color=Color.red()))
+        except discord.HTTPException as e:
+            log.warning(f"Auto-Close-Hinweis in {cid} nicht gesendet: {e}")
+        try:
             await self.close_ticket_internal(guild, cid, "Inaktivität", self.bot.user)
-            await asyncio.sleep(10)
-            await channel.delete(reason="Auto-Close")
-        except:
-            pass
+        except (discord.HTTPException, sqlite3.Error, OSError) as e:
+            # Channel bleibt bestehen, solange das Ticket nicht als geschlossen gespeichert ist
+            log.error(f"Auto-Close von Ticket {cid} fehlgeschlagen: {e}")
+            return
+        await self.delete_channel_later(guild, cid, "Auto-Close")
 
     # === TICKET ERSTELLUNG ===
     async def create_ticket_callback(self, interaction: Interaction, category: str):
         guild, user = interaction.guild, interaction.user
-        if user.id in await self.config.guild(guild).blacklist():
-            await interaction.response.send_message("❌ Du stehst auf der Blacklist.", ephemeral=True)
-            return
-        limit = await self.config.guild(guild).ticket_limit()
-        user_tickets = len([t for t in (await self.config.guild(guild).tickets()).values() if t.get("user_id") == user.id and t.get("status") == "open"])
-        if user_tickets >= limit:
-            await interaction.response.send_message(f"❌ Du hast bereits {limit} offene Tickets.", ephemeral=True)
-            return
-        cats = await self.config.guild(guild).categories()
-        if category not in cats or not cats[category].get("enabled", True):
-            await interaction.response.send_message("❌ Kategorie nicht gefunden.", ephemeral=True)
+
+        async def send(text):
+            if interaction.response.is_done():
+                await interaction.followup.send(text, ephemeral=True)
+            else:
+                await interaction.response.send_message(text, ephemeral=True)
+
+        async def prepare() -> bool:
+            st = await self.settings(guild)
+            if user.id in st.blacklist:
+                await send("❌ Du stehst auf der Blacklist.")
+                return False
+            if self.tindex(guild).open_count(user.id) >= st.ticket_limit:
+                await send(f"❌ Du hast bereits {st.ticket_limit} offene Tickets.")
+                return False
+            if category not in st.enabled_categories:
+                await send("❌ Kategorie nicht gefunden.")
+                return False
+            await interaction.response.defer(ephemeral=True, thinking=True)
+            return True
+
+        async with self.creation_slot(guild, user, send, prepare) as admitted:
+            if admitted:
+                await self.create_ticket(guild, user, category, interaction)
+
+    @asynccontextmanager
+    async def creation_slot(self, guild, user, send, prepare=None):
+        """Eine laufende Erstellung pro User und Zulassung über den Token-Bucket, liefert False nach einer Absage.
+
+        Die Prüfung auf eine laufende Erstellung kommt vor jedem await, ``prepare`` läuft bereits
+        innerhalb des Slots. Das Ticket-Limit wird nach der Zulassung erneut geprüft.
+        """
+        key = (guild.id, user.id)
+        if key in self._creating:
+            await send("⏳ Dein Ticket wird bereits erstellt.")
+            yield False
             return
-        await interaction.response.defer(ephemeral=True, thinking=True)
-        await self.create_ticket(guild, user, category, interaction)
+        self._creating.add(key)
+        try:
+            if prepare is not None and not await prepare():
+                yield False
+            elif not await self.admission.acquire(guild.id):
+                await send("❌ Gerade werden sehr viele Tickets erstellt, bitte versuche es gleich erneut.")
+                yield False
+            else:
+                limit = (await self.settings(guild)).ticket_limit
+                if self.tindex(guild).open_count(user.id) >= limit:
+                    await send(f"❌ Du hast bereits {limit} offene Tickets.")
+                    yield False
+                else:
+                    yield True
+        finally:
+            self._creating.discard(key)
 
     async def create_ticket(self, guild, user, cat_name, interaction=None):
-        cfg = self.config.guild(guild)
-        data = await cfg.all()
-        cat_id = data.get("ticket_category")
-        parent = guild.get_channel(cat_id) if cat_id else None
-        async with cfg.ticket_counter() as counter:
-            counter += 1
-            num = counter
-        name = data.get("ticket_name_format", "ticket-{counter}").format(counter=num, user=user.name.lower()[:10], category=cat_name.lower()[:10])
-        name = re.sub(r"[^a-z0-9\-]", "-", name)[:100]
+        st = await self.settings(guild)
+        base_id = st.categories.get(cat_name, {}).get("parent") or st.ticket_category
+        num = await self.counters.allocate(guild.id)
+        name = st.channel_name(num, user.name, cat_name)
         overwrites = {
             guild.default_role: discord.PermissionOverwrite(read_messages=False),
             user: discord.PermissionOverwrite(read_messages=True, send_messages=True, embed_links=True, attach_files=True),
             guild.me: discord.PermissionOverwrite(read_messages=True, send_messages=True, manage_channels=True, manage_messages=True),
         }
-        for rid in data.get("support_roles", []):
+        for rid in st.support_role_order:
             r = guild.get_role(rid)
             if r:
                 overwrites[r] = discord.PermissionOverwrite(read_messages=True, send_messages=True, manage_messages=True)
+        start = time.perf_counter()
+        channel = await self.take_pool_channel(guild, name, base_id, overwrites, f"Ticket von {user}")
+        if channel is None:
+            try:
+                channel = await self.create_sharded_channel(guild, base_id, PRIO_CREATE, name, overwrites, f"Ticket von {user}")
+            except discord.Forbidden:
+                if interaction:
+                    await interaction.followup.send("❌ Keine Berechtigung.", ephemeral=True)
+                return None
+            except Exception as e:
+                if interaction:
+                    await interaction.followup.send(f"❌ Fehler: {e}", ephemeral=True)
+                return None
+        self.record_step("channel", time.perf_counter() - start)
+
+        now = time.time()
+        tdata = {
+            "channel_id": channel.id,
+            "number": num,
+            "user_id": user.id,
+            "category": cat_name,
+            "created_at": datetime.datetime.fromtimestamp(now, datetime.timezone.utc).isoformat(),
+            "created_ts": now,
+            "status": "open",
+            "claim_by": None,
+            "last_activity": now,
+        }
+        # Ohne gespeicherten Datensatz wäre das Ticket nach einem Neustart verloren: nicht isoliert ausführen
+        start = time.perf_counter()
         try:
-            channel = await guild.create_text_channel(name=name, category=parent, overwrites=overwrites, reason=f"Ticket von {user}")
-        except discord.Forbidden:
+            await self.store.upsert(guild.id, tdata)
+        except sqlite3.Error as e:
+            log.error(f"Ticket #{num} in Guild {guild.id} nicht gespeichert: {e}")
+            self.work.post(PRIO_CLOSE, "channel_delete", lambda: channel.delete(reason="Ticket konnte nicht gespeichert werden"))
             if interaction:
-                await interaction.followup.send("❌ Keine Berechtigung.", ephemeral=True)
+                await interaction.followup.send("❌ Ticket konnte nicht gespeichert werden, bitte versuche es erneut.", ephemeral=True)
             return None
-        except Exception as e:
-            if interaction:
-                await interaction.followup.send(f"❌ Fehler: {e}", ephemeral=True)
+        finally:
+            self.record_step("store", time.perf_counter() - start)
+        self.tindex(guild).put(channel.id, tdata)
+        self.schedule_auto_close(guild.id, tdata)
+        if interaction:
+            await self.timed_step("reply", interaction.followup.send(f"✅ Ticket erstellt! {channel.mention}", ephemeral=True))
+
+        steps = [
+            self.timed_step("stats", self.record_stats(guild.id, create_deltas(tdata, now))),
+            self.timed_step("welcome", self.send_welcome(guild, user, channel, cat_name, num, st)),
+        ]
+        self.log_event(guild, "create", {"user": user, "channel": channel, "category": cat_name})
+        if st.dm_notifications:
+            self.send_create_dm(guild, user, channel)
+        await asyncio.gather(*steps)
+        return channel
+
+    # === CHANNEL-POOL ===
+    async def take_pool_channel(self, guild, name, base_id, overwrites, reason):
+        """Übernimmt einen Pool-Channel per Umbenennen und Rechte setzen, None wenn keiner bereitsteht."""
+        while True:
+            cid = self.pool.take(guild.id)
+            if cid is None:
+                return None
+            channel = guild.get_channel(cid)
+            if channel is None:
+                continue
+            parent, old = await self.reserve_parent(guild, base_id), channel.category_id
+            try:
+                await self.work.run(PRIO_CREATE, "channel_edit", lambda: channel.edit(name=name, category=parent, overwrites=overwrites, reason=reason))
+                self.shards.unplace(old, cid)
+                if parent:
+                    self.shards.place(parent.id, cid)
+                return channel
+            except discord.HTTPException as e:
+                if parent and category_full(e):
+                    self.shards.mark_full(parent.id)
+                log.warning(f"Pool-Channel {cid} nicht nutzbar: {e}")
+                await self._delete_pool_channel(guild.id, cid)
+            finally:
+                if parent:
+                    self.shards.release(parent.id)
+
+    async def _create_pool_channel(self, gid: int) -> Optional[int]:
+        guild = self.bot.get_guild(gid)
+        if guild is None:
             return None
+        st = await self.settings(guild)
+        overwrites = {
+            guild.default_role: discord.PermissionOverwrite(read_messages=False),
+            guild.me: discord.PermissionOverwrite(read_messages=True, send_messages=True, manage_channels=True, manage_messages=True),
+        }
+        try:
+            channel = await self.create_sharded_channel(guild, st.ticket_category, PRIO_NOTIFY, "ticket-pool", overwrites, "Ticket-Pool")
+        except discord.HTTPException as e:
+            log.warning(f"Pool-Channel in Guild {gid} nicht erstellt: {e}")
+            return None
+        return channel.id
 
-        cat_data = data.get("categories", {}).get(cat_name, {})
-        color = cat_data.get("color", data.get("embed_color", 0x3498db))
-        emoji = cat_data.get("emoji", "🎫")
-        tdata = {"channel_id": channel.id, "user_id": user.id, "category": cat_name, "created_at": datetime.datetime.now().isoformat(), "status": "open", "claim_by": None}
-        async with cfg.tickets() as tickets:
-            tickets[str(channel.id)] = tdata
+    async def _delete_pool_channel(self, gid: int, cid: int):
+        guild = self.bot.get_guild(gid)
+        channel = guild.get_channel(cid) if guild else None
+        if channel:
+            try:
+                await self.work.run(PRIO_CLOSE, "channel_delete", lambda: channel.delete(reason="Ticket-Pool verkleinert"))
+            except discord.HTTPException:
+                pass
 
-        welcome = data.get("welcome_message", "").format(user=user.mention, ticket_id=num, category=cat_name)
+    async def _persist_pool(self, gid: int, channel_ids: List[int]):
+        await self.config.guild_from_id(gid).pool_channels.set(channel_ids)
+
+    # === KATEGORIE-SHARDS ===
+    async def create_sharded_channel(self, guild, base_id, priority, name, overwrites, reason):
+        """Legt einen Text-Channel in der am wenigsten belegten Kategorie der Gruppe an.
+
+        Meldet Discord die Kategorie trotzdem als voll, wird sie übersprungen und einmal neu gewählt;
+        alle anderen Fehler gehen an den Aufrufer.
+        """
+        for attempt in range(2):
+            parent = await self.reserve_parent(guild, base_id)
+            try:
+                channel = await self.work.run(priority, "channel_create", lambda: guild.create_text_channel(name=name, category=parent, overwrites=overwrites, reason=reason))
+            except discord.HTTPException as e:
+                if parent is None or attempt or not category_full(e):
+                    raise
+                log.warning(f"Kategorie {parent.name} in Guild {guild.id} ist voll, wähle neu")
+                self.shards.mark_full(parent.id)
+                continue
+            finally:
+                if parent:
+                    self.shards.release(parent.id)
+            if parent:
+                self.shards.place(parent.id, channel.id)
+            return channel
+
+    async def reserve_parent(self, guild, base_id) -> Optional[CategoryChannel]:
+        """Reserviert einen Platz in der Gruppe von ``base_id``, legt bei Bedarf eine Überlauf-Kategorie an.
+
+        Der Aufrufer gibt die Reservierung mit ``shards.release`` wieder frei.
+        """
+        base = guild.get_channel(base_id) if base_id else None
+        if not isinstance(base, CategoryChannel):
+            return None
+        await self._track_group(guild, base.id)
+        pid = self.shards.pick(guild.id, base.id)
+        if pid is None:
+            # Alle Kategorien voll: auf die Überlauf-Kategorie warten statt zu scheitern
+            await asyncio.shield(self.grow_shards(guild, base, PRIO_CREATE))
+            pid = self.shards.pick(guild.id, base.id)
+            if pid is None:
+                log.warning(f"Keine freie Ticket-Kategorie in Guild {guild.id}, Channel wird ohne Kategorie erstellt")
+                return None
+        elif self.shards.needs_overflow(guild.id, base.id):
+            self.grow_shards(guild, base, PRIO_NOTIFY)
+        return guild.get_channel(pid)
+
+    async def _track_group(self, guild, base_id: int):
+        """Liest die Belegung noch unbekannter Kategorien einmalig aus dem Channel-Cache."""
+        stale = []
+        for pid in self.shards.group(guild.id, base_id):
+            if self.shards.tracked(pid):
+                continue
+            cat = guild.get_channel(pid)
+            if isinstance(cat, CategoryChannel):
+                self.shards.track(pid, [c.id for c in cat.channels])
+            else:
+                stale.append(pid)
+        if stale:
+            for pid in stale:
+                self.shards.remove_overflow(guild.id, pid)
+            await self._persist_shards(guild.id)
+
+    def grow_shards(self, guild, base, priority) -> asyncio.Task:
+        """Startet höchstens eine Erstellung einer Überlauf-Kategorie pro Gruppe."""
+        task = self._growing.get(base.id)
+        if task is None:
+            task = self._growing[base.id] = asyncio.create_task(self._add_overflow_category(guild, base, priority))
+            task.add_done_callback(lambda _: self._growing.pop(base.id, None))
+        return task
+
+    async def _add_overflow_category(self, guild, base, priority):
+        n = len(self.shards.group(guild.id, base.id)) + 1
+        try:
+            cat = await self.work.run(priority, "channel_create", lambda: guild.create_category(f"{base.name} {n}", overwrites=base.overwrites, reason="Ticket-Kategorie fast voll"))
+        except discord.HTTPException as e:
+            log.warning(f"Überlauf-Kategorie für {base.name} in Guild {guild.id} nicht erstellt: {e}")
+            return
+        self.shards.add_overflow(guild.id, base.id, cat.id)
+        await self._persist_shards(guild.id)
+        log.info(f"Überlauf-Kategorie {cat.name} in Guild {guild.id} erstellt")
+
+    async def shrink_shards(self, guild, base_id: int):
+        """Entfernt leere Überlauf-Kategorien, solange die Gruppe genug freie Plätze behält."""
+        removed = []
+        for cid in self.shards.removable(guild.id, base_id):
+            cat = guild.get_channel(cid)
+            if isinstance(cat, CategoryChannel) and cat.channels:
+                continue
+            self.shards.remove_overflow(guild.id, cid)
+            removed.append(cid)
+            if cat:
+                self.work.post(PRIO_NOTIFY, "channel_delete", lambda cat=cat: cat.delete(reason="Überlauf-Kategorie leer"))
+        if removed:
+            await self._persist_shards(guild.id)
+
+    async def _persist_shards(self, gid: int):
+        await self.config.guild_from_id(gid).overflow_categories.set({str(base): ids for base, ids in self.shards.overflows(gid).items()})
+
+    @commands.Cog.listener()
+    async def on_guild_channel_create(self, channel):
+        self.shards.place(channel.category_id, channel.id)
+
+    @commands.Cog.listener()
+    async def on_guild_channel_delete(self, channel):
+        # Von Hand gelöschte Pool-Channels nicht mehr vergeben, der Pool füllt nach
+        self.pool.discard(channel.guild.id, channel.id)
+        if isinstance(channel, CategoryChannel):
+            if self.shards.remove_overflow(channel.guild.id, channel.id):
+                await self._persist_shards(channel.guild.id)
+            else:
+                self.shards.forget(channel.id)
+            return
+        self.shards.unplace(channel.category_id, channel.id)
+        if channel.category_id and self.shards.tracked(channel.category_id):
+            await self.shrink_shards(channel.guild, self.shards.base_of(channel.category_id))
+
+    @commands.Cog.listener()
+    async def on_guild_channel_update(self, before, after):
+        if before.category_id != after.category_id:
+            self.shards.unplace(before.category_id, before.id)
+            self.shards.place(after.category_id, after.id)
+            if before.category_id and self.shards.tracked(before.category_id):
+                await self.shrink_shards(after.guild, self.shards.base_of(before.category_id))
+
+    def record_step(self, name: str, seconds: float):
+        self._step_times.setdefault(name, deque(maxlen=CREATE_STEP_SAMPLES)).append(seconds)
+
+    async def timed_step(self, name: str, coro):
+        """Führt einen Erstellungsschritt mit Zeitlimit aus, Fehler bleiben auf den Schritt beschränkt."""
+        start = time.perf_counter()
+        try:
+            await asyncio.wait_for(coro, CREATE_STEP_TIMEOUT)
+        except asyncio.TimeoutError:
+            log.warning(f"Ticket-Schritt '{name}': Zeitüberschreitung")
+        except Exception as e:
+            log.warning(f"Ticket-Schritt '{name}' fehlgeschlagen: {e}")
+        finally:
+            self.record_step(name, time.perf_counter() - start)
+
+    async def send_welcome(self, guild, user, channel, cat_name, num, st: GuildSettings):
+        cat_data = st.categories.get(cat_name, {})
+        color = cat_data.get("color", st.embed_color)
+        emoji = cat_data.get("emoji", "🎫")
+        welcome = st.welcome_message.format(user=user.mention, ticket_id=num, category=cat_name)
         embed = Embed(title=f"{emoji} Ticket #{num}", description=welcome, color=Color(color), timestamp=datetime.datetime.now(datetime.timezone.utc))
-        if data.get("show_user_info", True):
+        if st.show_user_info:
             embed.add_field(name="Ersteller", value=f"{user.mention}\n{user} ({user.id})")
             embed.set_thumbnail(url=user.display_avatar.url)
         embed.add_field(name="Kategorie", value=cat_name, inline=True)
 
         content = None
-        if data.get("ping_on_create", True):
-            prid = data.get("ping_role")
-            if prid:
-                pr = guild.get_role(prid)
+        if st.ping_on_create:
+            if st.ping_role:
+                pr = guild.get_role(st.ping_role)
                 if pr:
                     content = pr.mention
             else:
-                mentions = [guild.get_role(r).mention for r in data.get("support_roles", []) if guild.get_role(r)][:3]
+                mentions = [guild.get_role(r).mention for r in st.support_role_order if guild.get_role(r)][:3]
                 if mentions:
                     content = " ".join(mentions)
 
-        view = TicketControlView(self, channel.id)
-        await channel.send(content=content, embed=embed, view=view)
+        await channel.send(content=content, embed=embed, view=self.control_view)
 
-        if data.get("dm_notifications", True):
-            try:
-                await user.send(embed=Embed(title="🎫 Ticket erstellt", description=f"Ticket auf **{guild.name}** erstellt.\n**Channel:** {channel.mention}", color=Color.green()))
-            except:
-                pass
+    def send_create_dm(self, guild, user, channel):
+        embed = Embed(title="🎫 Ticket erstellt", description=f"Ticket auf **{guild.name}** erstellt.\n**Channel:** {channel.mention}", color=Color.green())
+        self.work.post(PRIO_NOTIFY, "dm", lambda: self._timed_dm(user, embed=embed))
 
-        await self.log_event(guild, "create", {"user": user, "channel": channel, "category": cat_name})
-        if interaction:
-            await interaction.followup.send(f"✅ Ticket erstellt! {channel.mention}", ephemeral=True)
-        return channel
+    async def _timed_dm(self, user, **kwargs):
+        # Gemessen wird der eigentliche Versand im Auftrag, nicht das Einreihen
+        start = time.perf_counter()
+        try:
+            await self._send_dm(user, **kwargs)
+        finally:
+            self.record_step("dm", time.perf_counter() - start)
+
+    async def _send_dm(self, user, **kwargs):
+        try:
+            await user.send(**kwargs)
+        except discord.Forbidden:
+            pass
+
+    def send_feedback_dm(self, guild, tdata):
+        user = guild.get_member(tdata.get("user_id"))
+        if user:
+            embed = Embed(title="⭐ Feedback", description="Bitte bewerte dein Ticket.", color=Color.gold())
+            view = FeedbackView(self, guild.id, tdata["channel_id"], user.id)
+            self.work.post(PRIO_NOTIFY, "dm", lambda: self._send_dm(user, embed=embed, view=view))
+
+    async def delete_channel_later(self, guild, cid, reason, delay=10):
+        """Plant das Löschen des Channels als dauerhaften Auftrag, auch über Neustarts hinweg."""
+        await self.jobs.schedule(guild.id, "delete_channel", cid, delay, {"reason": reason})
+
+    async def job_delete_channel(self, job):
+        guild = self.bot.get_guild(job["guild_id"])
+        ch = guild.get_channel(job["target"]) if guild else None
+        if ch is None:
+            return
+        try:
+            await self.work.run(PRIO_CLOSE, "channel_delete", lambda: ch.delete(reason=job["payload"].get("reason")))
+        except discord.NotFound:
+            pass
+
+    async def dispatch_control(self, interaction: Interaction, custom_id: str):
+        """Leitet Klicks auf die Ticket-Steuerung anhand der custom_id weiter."""
+        cid = interaction.channel_id
+        if interaction.guild is None or cid not in self.tindex(interaction.guild):
+            await interaction.response.send_message("❌ Kein Ticket-Channel.", ephemeral=True)
+            return
+        action = custom_id[len(CONTROL_PREFIX):]
+        if action == "close":
+            await interaction.response.send_modal(CloseReasonModal(self, cid))
+        elif action == "claim":
+            await self.claim_ticket(interaction, cid)
+        elif action == "transcript":
+            await self.generate_transcript_cmd(interaction, cid)
 
     # === TICKET SCHLIESSUNG ===
     async def close_ticket_interaction(self, interaction, cid, reason):
         guild, user = interaction.guild, interaction.user
-        cfg = self.config.guild(guild)
-        tickets = await cfg.tickets()
-        if str(cid) not in tickets:
+        tdata = self.tindex(guild).get(cid)
+        if tdata is None:
             await interaction.response.send_message("❌ Kein Ticket-Channel.", ephemeral=True)
             return
-        tdata = tickets[str(cid)]
         if not await self.can_close(user, guild, tdata):
             await interaction.response.send_message("❌ Keine Berechtigung.", ephemeral=True)
             return
         await interaction.response.defer()
         await self.close_ticket_internal(guild, cid, reason, user)
-        if await cfg.feedback_enabled():
-            tuser = guild.get_member(tdata.get("user_id"))
-            if tuser:
-                try:
-                    await tuser.send(embed=Embed(title="⭐ Feedback", description="Bitte bewerte dein Ticket.", color=Color.gold()), view=FeedbackView(self, str(cid), tuser.id))
-                except:
-                    pass
+        if (await self.settings(guild)).feedback_enabled:
+            self.send_feedback_dm(guild, tdata)
         await interaction.followup.send("✅ Ticket geschlossen. Channel wird in 10s gelöscht.", ephemeral=True)
-        await asyncio.sleep(10)
-        ch = guild.get_channel(cid)
-        if ch:
-            try:
-                await ch.delete(reason=f"Geschlossen: {reason}")
-            except:
-                pass
+        await self.delete_channel_later(guild, cid, f"Geschlossen: {reason}")
 
     async def close_ticket_internal(self, guild, cid, reason, closer):
-        cfg = self.config.guild(guild)
-        async with cfg.tickets() as tickets:
-            if str(cid) in tickets:
-                tickets[str(cid)]["status"] = "closed"
-                tickets[str(cid)]["close_reason"] = reason
-                tickets[str(cid)]["closed_by"] = closer.id
-        await self.log_event(guild, "close", {"closer": closer, "channel_id": cid, "reason": reason})
+        changes = await self.close_changes(guild, cid, reason, closer.id)
+        await self.store.update(guild.id, cid, **changes)
+        deltas = await self.apply_close(guild, cid, changes)
+        if deltas:
+            await self.record_stats(guild.id, deltas)
+        self.log_event(guild, "close", {"closer": closer, "channel_id": cid, "reason": reason})
+
+    async def close_changes(self, guild, cid, reason, closer_id) -> dict:
+        """Felder für das Schließen, inklusive endgültigem Transkript falls der Channel noch existiert."""
+        changes = {"status": "closed", "close_reason": reason, "closed_by": closer_id, "closed_at": time.time()}
+        channel = guild.get_channel(cid)
+        if channel:
+            path = await self.finalize_transcript(channel)
+            if path:
+                changes["transcript"] = path
+        return changes
+
+    async def apply_close(self, guild, cid, changes) -> list:
+        """Nachlauf eines gespeicherten Schließens (Index, Fristen, SLA, Volltext), gibt die Statistik-Deltas zurück."""
+        tdata = self.tindex(guild).get(cid)
+        was_open = tdata is not None and tdata.get("status") == "open"
+        self.tindex(guild).update(cid, **changes)
+        self.deadlines.cancel((guild.id, cid))
+        deltas = []
+        if was_open:
+            deltas = close_deltas(changes["closed_at"])
+            await self.record_sla(guild.id, "resolution", tdata, changes["closed_at"], tdata.get("claim_by") or tdata.get("first_responder"))
+        if tdata is not None and changes.get("transcript"):
+            await self.index_transcript(guild.id, tdata)
+        return deltas
+
+    async def index_transcript(self, gid: int, tdata: dict):
+        """Nimmt das endgültige Transkript in die Volltextsuche auf, Fehler bleiben beim Index."""
+        try:
+            await self.store.index_transcript(gid, tdata, self.transcripts.root / tdata["transcript"], skip=len(header_lines("", "")))
+        except Exception as e:
+            log.error(f"Transkript {tdata['channel_id']} nicht indiziert: {e}")
+
+    # === MASSENAKTIONEN ===
+    def start_bulk(self, guild, run, status):
+        task = self._bulk_tasks[guild.id] = asyncio.create_task(self.run_bulk(guild, run, status))
+        task.add_done_callback(lambda t: self._bulk_done(guild.id, t))
+
+    def _bulk_done(self, gid: int, task: asyncio.Task):
+        self._bulk_tasks.pop(gid, None)
+        if not task.cancelled() and task.exception():
+            # Zustand bleibt gespeichert, der Lauf kann mit bulkresume fortgesetzt werden
+            log.error(f"Massenaktion in Guild {gid} abgebrochen: {task.exception()}", exc_info=task.exception())
+
+    async def run_bulk(self, guild, run, status):
+        """Bearbeitet die verbleibenden Tickets in Blöcken, der Zustand wird nach jedem Block gespeichert."""
+        sem = asyncio.Semaphore(BULK_CONCURRENCY)
+        lock = asyncio.Lock()
+        out = gzip.open(run["export"], "ab") if run["kind"] == "export" else None
+        last = time.monotonic()
+
+        async def one(cid):
+            async with sem:
+                try:
+                    if out is not None:
+                        return await self._bulk_export_one(guild, cid, out, lock)
+                    return await self._bulk_close_one(guild, cid, run)
+                except (discord.HTTPException, OSError) as e:
+                    log.warning(f"Massenaktion: Ticket {cid} fehlgeschlagen: {e}")
+                    return None
+
+        try:
+            while run["targets"]:
+                batch = run["targets"][:BULK_BATCH]
+                results = dict(zip(batch, await asyncio.gather(*(one(cid) for cid in batch))))
+                if out is None:
+                    await self._bulk_close_batch(guild, {cid: ch for cid, ch in results.items() if ch}, run["reason"])
+                ok = sum(1 for r in results.values() if r)
+                run["done"] += ok
+                run["skipped"] += len(batch) - ok
+                del run["targets"][: len(batch)]
+                await self.store.save_bulk_run(guild.id, run)
+                if time.monotonic() - last >= BULK_PROGRESS_SECONDS:
+                    last = time.monotonic()
+                    await self._bulk_progress(status, run)
+        finally:
+            if out is not None:
+                out.close()
+        self._bulk_runs.pop(guild.id, None)
+        await self.store.save_bulk_run(guild.id, None)
+        await self._bulk_progress(status, run, final=True)
+        if out is not None:
+            size = Path(run["export"]).stat().st_size
+            if run["done"] and size <= guild.filesize_limit:
+                await status.channel.send(file=discord.File(run["export"], filename=Path(run["export"]).name))
+            elif run["done"]:
+                await status.channel.send(f"📦 Export zu groß zum Hochladen ({size // 1024} KB), gespeichert unter `{run['export']}`.")
+        else:
+            self.log_event(guild, "bulkclose", {"closer": run["actor"], "filter": run["filter"], "closed": run["done"]})
+
+    async def _bulk_progress(self, status, run, final=False):
+        head = "✅ Abgeschlossen" if final else "⏳ Läuft"
+        text = f"{head}: {run['done']}/{run['total']} erledigt, {run['skipped']} übersprungen (Filter: {run['filter']})"
+        try:
+            await status.edit(content=text)
+        except discord.HTTPException:
+            pass
+
+    async def _bulk_close_one(self, guild, cid, run) -> Optional[dict]:
+        tdata = self.tindex(guild).get(cid)
+        if tdata is None or tdata.get("status") != "open":
+            return None
+        return await self.close_changes(guild, cid, run["reason"], run["actor"])
+
+    async def _bulk_close_batch(self, guild, updates: Dict[int, dict], reason: str):
+        """Ein Schreibvorgang für den ganzen Block, Statistiken gesammelt, Löschen als Aufträge."""
+        if not updates:
+            return
+        await self.store.update_many(guild.id, updates)
+        deltas = []
+        for cid, changes in updates.items():
+            deltas += await self.apply_close(guild, cid, changes)
+            await self.delete_channel_later(guild, cid, f"Geschlossen: {reason}")
+        if deltas:
+            await self.record_stats(guild.id, deltas)
+
+    async def _bulk_export_one(self, guild, cid, out, lock) -> bool:
+        tdata = self.tindex(guild).get(cid) or {}
+        channel = guild.get_channel(cid)
+        title = f"===== Ticket #{tdata.get('number', '?')} ({cid}) ====="
+        if channel:
+            header = header_lines(channel.name, guild.name)
+
+            def write():
+                out.write((title + "\n" + "\n".join(header) + "\n").encode("utf-8"))
+                self.transcripts.copy_to(guild.id, cid, out.write)
+                out.write(b"\n")
+
+            async with self.transcripts.lock(guild.id, cid):
+                await self.update_transcript_cache(channel)
+                async with lock:
+                    await self.render.run(write)
+            return True
+        if not (tdata.get("transcript") and (self.transcripts.root / tdata["transcript"]).is_file()):
+            return False
+        src = self.transcripts.root / tdata["transcript"]
+
+        def write():
+            out.write((title + "\n").encode("utf-8"))
+            with open(src, "rb") as f:
+                shutil.copyfileobj(f, out)
+            out.write(b"\n")
+
+        async with lock:
+            await self.render.run(write)
+        return True
 
     async def can_close(self, user, guild, tdata):
         if tdata.get("user_id") == user.id:
             return True
-        sroles = await self.config.guild(guild).support_roles()
-        if any(r.id in sroles for r in user.roles):
-            return True
-        aroles = await self.config.guild(guild).admin_roles()
-        if any(r.id in aroles for r in user.roles):
+        if (await self.settings(guild)).is_staff(r.id for r in user.roles):
             return True
         if user.guild_permissions.administrator:
             return True
         return False
 
+    async def is_support(self, member) -> bool:
+        return (await self.settings(member.guild)).is_support(r.id for r in member.roles) or member.guild_permissions.administrator
+
     # === CLAIM ===
     async def claim_ticket(self, interaction, cid):
         guild, user = interaction.guild, interaction.user
-        cfg = self.config.guild(guild)
-        if not await cfg.claim_enabled():
+        if not (await self.settings(guild)).claim_enabled:
             await interaction.response.send_message("❌ Claim deaktiviert.", ephemeral=True)
             return
-        sroles = await cfg.support_roles()
-        if not any(r.id in sroles for r in user.roles) and not user.guild_permissions.administrator:
+        if not await self.is_support(user):
             await interaction.response.send_message("❌ Keine Berechtigung.", ephemeral=True)
             return
-        async with cfg.tickets() as tickets:
-            if str(cid) not in tickets:
-                await interaction.response.send_message("❌ Kein Ticket.", ephemeral=True)
-                return
-            if tickets[str(cid)].get("claim_by"):
-                c = guild.get_member(tickets[str(cid)]["claim_by"])
-                await interaction.response.send_message(f"❌ Bereits von {c.mention if c else 'jemandem'} geclaimt.", ephemeral=True)
-                return
-            tickets[str(cid)]["claim_by"] = user.id
+        tdata = self.tindex(guild).get(cid)
+        if tdata is None:
+            await interaction.response.send_message("❌ Kein Ticket.", ephemeral=True)
+            return
+        if tdata.get("claim_by"):
+            c = guild.get_member(tdata["claim_by"])
+            await interaction.response.send_message(f"❌ Bereits von {c.mention if c else 'jemandem'} geclaimt.", ephemeral=True)
+            return
+        now = time.time()
+        self.tindex(guild).update(cid, claim_by=user.id, claimed_at=now)
+        await self.store.update(guild.id, cid, claim_by=user.id, claimed_at=now)
+        await self.record_stats(guild.id, claim_deltas(user.id))
         await interaction.response.send_message(embed=Embed(title="✋ Geclaimt", description=f"{user.mention} kümmert sich.", color=Color.green()))
-        await self.log_event(guild, "claim", {"user": user, "channel_id": cid})
+        self.log_event(guild, "claim", {"user": user, "channel_id": cid})
 
     # === TRANSCRIPT ===
     async def generate_transcript_cmd(self, interaction, cid):
@@ -434,32 +1269,165 @@ class LFBBotTicketTool(commands.Cog):
             await interaction.response.send_message("❌ Channel nicht gefunden.", ephemeral=True)
             return
         await interaction.response.defer(ephemeral=True)
-        msgs = []
-        async for m in channel.history(limit=None, oldest_first=True):
-            msgs.append(m)
-        if not msgs:
-            await interaction.followup.send("❌ Keine Nachrichten.", ephemeral=True)
-            return
-        lines = [f"Transkript - {channel.name}", f"Server: {interaction.guild.name}", f"Zeit: {datetime.datetime.now().strftime('%d.%m.%Y %H:%M')}", "=" * 40, ""]
-        for m in msgs:
-            lines.append(f"[{m.created_at.strftime('%d.%m.%Y %H:%M')}] {m.author}: {m.content or '[Medien]'}")
-        file = discord.File(fp="\n".join(lines).encode("utf-8"), filename=f"transcript_{channel.name}.txt")
-        await interaction.followup.send(file=file, ephemeral=True)
+        await self.run_transcript(channel, lambda **kw: interaction.followup.send(ephemeral=True, wait=True, **kw))
+
+    async def update_transcript_cache(self, channel, progress=None) -> int:
+        """Hängt alle Nachrichten nach der letzten gecachten an, gibt die Gesamtzahl zurück.
+
+        Der Aufrufer hält ``transcripts.lock`` des Channels.
+        """
+        gid, cid = channel.guild.id, channel.id
+        for _ in range(3):
+            gen = self.transcripts.generation(gid, cid)
+            last = self.transcripts.last_id(gid, cid)
+            n = self.transcripts.count(gid, cid)
+            buf, ok = [], True
+            async for m in channel.history(limit=None, oldest_first=True, after=discord.Object(id=last) if last else None):
+                buf.append(message_fields(m))
+                last = m.id
+                n += 1
+                if len(buf) >= TRANSCRIPT_CACHE_BATCH:
+                    ok = await self.render.run(self._append_rendered, gid, cid, buf, last, gen)
+                    buf = []
+                    if not ok:
+                        break
+                if progress and n % TRANSCRIPT_PROGRESS_EVERY == 0:
+                    await progress(n)
+            if ok and buf:
+                ok = await self.render.run(self._append_rendered, gid, cid, buf, last, gen)
+            if ok:
+                return n
+        return self.transcripts.count(gid, cid)
+
+    def _append_rendered(self, gid, cid, fields, last, gen) -> bool:
+        # Läuft im Render-Pool: Formatieren und Schreiben außerhalb des Event-Loops
+        return self.transcripts.append(gid, cid, [format_fields(*f) for f in fields], last, gen)
+
+    async def build_transcript(self, channel, progress=None, compress=False) -> Optional[TranscriptWriter]:
+        """Aktualisiert den Transkript-Cache und streamt ihn in eine Datei, None wenn leer."""
+        async with self.transcripts.lock(channel.guild.id, channel.id):
+            n = await self.update_transcript_cache(channel, progress)
+            if not n:
+                return None
+            writer = TranscriptWriter(f"transcript_{channel.name}.txt", compress)
+            try:
+                for line in header_lines(channel.name, channel.guild.name):
+                    writer.write(line)
+                await self.render.run(self.transcripts.copy_to, channel.guild.id, channel.id, writer.write_bytes)
+            except BaseException:
+                writer.close()
+                raise
+        writer.count = n
+        return writer
+
+    async def build_html_transcript(self, channel, progress=None, compress=False) -> Optional[List[TranscriptWriter]]:
+        """HTML-Transkript plus JSON-Lines in einem Durchlauf, Anhänge nur als Metadaten."""
+        renderer = HtmlTranscript(f"transcript_{channel.name}", channel.name, channel.guild.name, compress)
+        batch, pending, n = [], None, 0
+        try:
+            # Abrufen im Event-Loop, Rendern des vorigen Blocks parallel im Render-Pool
+            async for m in channel.history(limit=None, oldest_first=True):
+                batch.append(message_record(m))
+                n += 1
+                if len(batch) >= TRANSCRIPT_CACHE_BATCH:
+                    if pending:
+                        await pending
+                    pending, batch = asyncio.ensure_future(self.render.run(renderer.add_many, batch)), []
+                if progress and n % TRANSCRIPT_PROGRESS_EVERY == 0:
+                    await progress(n)
+            if pending:
+                await pending
+            pending = None
+            await self.render.run(renderer.add_many, batch)
+        except BaseException:
+            if pending:
+                await asyncio.gather(pending, return_exceptions=True)
+            renderer.close()
+            raise
+        if not renderer.count:
+            renderer.close()
+            return None
+        return await self.render.run(renderer.finish)
+
+    async def finalize_transcript(self, channel) -> Optional[str]:
+        """Bringt den Cache auf Stand und macht ihn zum endgültigen Transkript."""
+        try:
+            async with self.transcripts.lock(channel.guild.id, channel.id):
+                await self.update_transcript_cache(channel)
+                path = await self.render.run(self.transcripts.finalize, channel.guild.id, channel.id, header_lines(channel.name, channel.guild.name))
+        except (discord.HTTPException, OSError) as e:
+            log.error(f"Transkript für {channel.id} fehlgeschlagen: {e}")
+            return None
+        return str(path.relative_to(self.transcripts.root))
+
+    async def run_transcript(self, channel, send, compress=False, html=False):
+        """Gemeinsamer Ablauf für Button und Befehl: erstellen, Fortschritt zeigen, hochladen."""
+        status, last = None, 0.0
+
+        async def progress(n):
+            nonlocal status, last
+            if time.monotonic() - last < TRANSCRIPT_PROGRESS_SECONDS:
+                return
+            last = time.monotonic()
+            text = f"⏳ Transkript wird erstellt... {n} Nachrichten"
+            try:
+                if status is None:
+                    status = await send(content=text)
+                else:
+                    await status.edit(content=text)
+            except discord.HTTPException:
+                pass
+
+        if html:
+            writers = await self.build_html_transcript(channel, progress, compress)
+        else:
+            writer = await self.build_transcript(channel, progress, compress)
+            writers = [writer] if writer else None
+        if not writers:
+            await send(content="❌ Keine Nachrichten.")
+            return
+        try:
+            files = await self.render.run(lambda: [discord.File(w.finish(), filename=w.filename) for w in writers])
+            await send(files=files)
+        finally:
+            for w in writers:
+                w.close()
+        if status:
+            try:
+                await status.edit(content=f"✅ Transkript erstellt ({writers[0].count} Nachrichten).")
+            except discord.HTTPException:
+                pass
 
     # === FEEDBACK ===
-    async def save_feedback(self, interaction, tid, uid, rating, comment):
-        async with self.config.user_from_id(uid).feedback() as fb:
-            fb.append({"ticket_id": tid, "rating": rating, "comment": comment, "time": datetime.datetime.now().isoformat()})
+    def tfeedback(self, gid: int) -> FeedbackStats:
+        fb = self._feedback.get(gid)
+        if fb is None:
+            fb = self._feedback[gid] = FeedbackStats()
+        return fb
+
+    async def save_feedback(self, interaction, gid, cid, uid, rating, comment):
+        tdata = self.tindex(gid).get(cid) or await self.store.get(gid, cid) or {}
+        now = time.time()
+        record = {
+            "channel_id": cid,
+            "number": tdata.get("number"),
+            "user_id": uid,
+            "category": tdata.get("category"),
+            "claim_by": tdata.get("claim_by"),
+            "rating": rating,
+            "comment": comment or None,
+            "ts": now,
+        }
+        deltas = feedback_deltas(rating, record["category"], record["claim_by"], now)
+        if not await self.store.add_feedback(gid, record, deltas):
+            await interaction.response.send_message("❌ Dieses Ticket wurde bereits bewertet.", ephemeral=True)
+            return
+        self.tfeedback(gid).apply(deltas)
         await interaction.response.send_message(f"✅ Danke! Bewertung: {'⭐' * rating}", ephemeral=True)
 
     # === HELPERS ===
-    async def log_event(self, guild, etype, data):
-        lid = await self.config.guild(guild).log_channel()
-        if not lid:
-            return
-        lc = guild.get_channel(lid)
-        if not lc:
-            return
+    def log_event(self, guild, etype, data):
+        """Reiht ein Log-Ereignis ein, gesendet wird gebündelt vom LogDispatcher."""
         e = Embed(title=f"📋 {etype}", color=Color.blue(), timestamp=datetime.datetime.now(datetime.timezone.utc))
         for k, v in data.items():
             if isinstance(v, (Member, User)):
@@ -467,10 +1435,12 @@ class LFBBotTicketTool(commands.Cog):
             elif isinstance(v, TextChannel):
                 v = f"{v.mention}"
             e.add_field(name=k, value=str(v)[:1024], inline=False)
-        try:
-            await lc.send(embed=e)
-        except:
-            pass
+        self.logs.enqueue(guild.id, e)
+
+    async def _resolve_log_channel(self, gid: int):
+        guild = self.bot.get_guild(gid)
+        lid = (await self.settings(gid)).log_channel if guild else None
+        return guild.get_channel(lid) if lid else None
 
     # === USER COMMANDS ===
     @commands.hybrid_group(name="ticket", aliases=["tickets"])
@@ -483,56 +1453,46 @@ class LFBBotTicketTool(commands.Cog):
     @ticket.command(name="new", aliases=["neu", "create", "erstellen"])
     async def t_new(self, ctx, kategorie: Optional[str] = None):
         """Erstellt ein neues Ticket"""
-        cats = await self.config.guild(ctx.guild).categories()
-        enabled = {k: v for k, v in cats.items() if v.get("enabled", True)}
+        st = await self.settings(ctx.guild)
+        enabled = st.enabled_categories
         if not enabled:
             await ctx.send("❌ Keine Kategorien.")
             return
-        cat = kategorie or (await self.config.guild(ctx.guild).default_category()) or list(enabled.keys())[0]
+        cat = kategorie or st.default_category or enabled[0]
         if cat not in enabled:
-            await ctx.send(f"❌ Kategorie nicht gefunden. Verfügbar: {humanize_list(list(enabled.keys()))}")
+            await ctx.send(f"❌ Kategorie nicht gefunden. Verfügbar: {humanize_list(list(enabled))}")
             return
-        await self.create_ticket(ctx.guild, ctx.author, cat)
+        async with self.creation_slot(ctx.guild, ctx.author, ctx.send) as admitted:
+            if admitted:
+                await self.create_ticket(ctx.guild, ctx.author, cat)
 
     @ticket.command(name="close", aliases=["schliessen", "zu"])
     async def t_close(self, ctx, *, grund: str = "Kein Grund"):
         """Schließt das aktuelle Ticket"""
-        tickets = await self.config.guild(ctx.guild).tickets()
-        if str(ctx.channel.id) not in tickets:
+        tdata = self.tindex(ctx.guild).get(ctx.channel.id)
+        if tdata is None:
             await ctx.send("❌ Kein Ticket-Channel.")
             return
-        tdata = tickets[str(ctx.channel.id)]
         if not await self.can_close(ctx.author, ctx.guild, tdata):
             await ctx.send("❌ Keine Berechtigung.")
             return
         await self.close_ticket_internal(ctx.guild, ctx.channel.id, grund, ctx.author)
-        if await self.config.guild(ctx.guild).feedback_enabled():
-            u = ctx.guild.get_member(tdata.get("user_id"))
-            if u:
-                try:
-                    await u.send(embed=Embed(title="⭐ Feedback", description="Bitte bewerte dein Ticket.", color=Color.gold()), view=FeedbackView(self, str(ctx.channel.id), u.id))
-                except:
-                    pass
+        if (await self.settings(ctx.guild)).feedback_enabled:
+            self.send_feedback_dm(ctx.guild, tdata)
         await ctx.send("✅ Geschlossen. Channel wird in 10s gelöscht.")
-        await asyncio.sleep(10)
-        try:
-            await ctx.channel.delete(reason=grund)
-        except:
-            pass
+        await self.delete_channel_later(ctx.guild, ctx.channel.id, grund)
 
     @ticket.command(name="add", aliases=["hinzufuegen"])
     async def t_add(self, ctx, user: Member):
         """Fügt User zum Ticket hinzu"""
-        tickets = await self.config.guild(ctx.guild).tickets()
-        if str(ctx.channel.id) not in tickets:
+        if ctx.channel.id not in self.tindex(ctx.guild):
             await ctx.send("❌ Kein Ticket.")
             return
-        sroles = await self.config.guild(ctx.guild).support_roles()
-        if not any(r.id in sroles for r in ctx.author.roles) and not ctx.author.guild_permissions.administrator:
+        if not await self.is_support(ctx.author):
             await ctx.send("❌ Keine Berechtigung.")
             return
         try:
-            await ctx.channel.set_permissions(user, read_messages=True, send_messages=True, embed_links=True, attach_files=True)
+            await self.work.run(PRIO_CLOSE, "permissions", lambda: ctx.channel.set_permissions(user, read_messages=True, send_messages=True, embed_links=True, attach_files=True))
             await ctx.send(f"✅ {user.mention} hinzugefügt.")
         except Exception as e:
             await ctx.send(f"❌ Fehler: {e}")
@@ -540,19 +1500,18 @@ class LFBBotTicketTool(commands.Cog):
     @ticket.command(name="remove", aliases=["entfernen"])
     async def t_remove(self, ctx, user: Member):
         """Entfernt User vom Ticket"""
-        tickets = await self.config.guild(ctx.guild).tickets()
-        if str(ctx.channel.id) not in tickets:
+        tdata = self.tindex(ctx.guild).get(ctx.channel.id)
+        if tdata is None:
             await ctx.send("❌ Kein Ticket.")
             return
-        sroles = await self.config.guild(ctx.guild).support_roles()
-        if not any(r.id in sroles for r in ctx.author.roles) and not ctx.author.guild_permissions.administrator:
+        if not await self.is_support(ctx.author):
             await ctx.send("❌ Keine Berechtigung.")
             return
-        if tickets[str(ctx.channel.id)].get("user_id") == user.id:
+        if tdata.get("user_id") == user.id:
             await ctx.send("❌ Ersteller kann nicht entfernt werden.")
             return
         try:
-            await ctx.channel.set_permissions(user, overwrite=None)
+            await self.work.run(PRIO_CLOSE, "permissions", lambda: ctx.channel.set_permissions(user, overwrite=None))
             await ctx.send(f"✅ {user.mention} entfernt.")
         except Exception as e:
             await ctx.send(f"❌ Fehler: {e}")
@@ -560,54 +1519,44 @@ class LFBBotTicketTool(commands.Cog):
     @ticket.command(name="claim")
     async def t_claim(self, ctx):
         """Claim das Ticket"""
-        if not await self.config.guild(ctx.guild).claim_enabled():
+        if not (await self.settings(ctx.guild)).claim_enabled:
             await ctx.send("❌ Claim deaktiviert.")
             return
-        tickets = await self.config.guild(ctx.guild).tickets()
-        if str(ctx.channel.id) not in tickets:
+        tdata = self.tindex(ctx.guild).get(ctx.channel.id)
+        if tdata is None:
             await ctx.send("❌ Kein Ticket.")
             return
-        sroles = await self.config.guild(ctx.guild).support_roles()
-        if not any(r.id in sroles for r in ctx.author.roles) and not ctx.author.guild_permissions.administrator:
+        if not await self.is_support(ctx.author):
             await ctx.send("❌ Keine Berechtigung.")
             return
-        if tickets[str(ctx.channel.id)].get("claim_by"):
-            c = ctx.guild.get_member(tickets[str(ctx.channel.id)]["claim_by"])
+        if tdata.get("claim_by"):
+            c = ctx.guild.get_member(tdata["claim_by"])
             await ctx.send(f"❌ Bereits von {c.mention if c else 'jemandem'} geclaimt.")
             return
-        async with self.config.guild(ctx.guild).tickets() as t:
-            t[str(ctx.channel.id)]["claim_by"] = ctx.author.id
+        now = time.time()
+        self.tindex(ctx.guild).update(ctx.channel.id, claim_by=ctx.author.id, claimed_at=now)
+        await self.store.update(ctx.guild.id, ctx.channel.id, claim_by=ctx.author.id, claimed_at=now)
+        await self.record_stats(ctx.guild.id, claim_deltas(ctx.author.id))
         await ctx.send(embed=Embed(title="✋ Geclaimt", description=f"{ctx.author.mention} kümmert sich.", color=Color.green()))
 
     @ticket.command(name="transcript")
-    async def t_transcript(self, ctx):
-        """Erstellt Transkript"""
-        tickets = await self.config.guild(ctx.guild).tickets()
-        if str(ctx.channel.id) not in tickets:
+    async def t_transcript(self, ctx, art: str = "txt", komprimiert: bool = False):
+        """Erstellt Transkript (art: txt oder html, komprimiert: als .gz)"""
+        if ctx.channel.id not in self.tindex(ctx.guild):
             await ctx.send("❌ Kein Ticket.")
             return
         async with ctx.typing():
-            msgs = []
-            async for m in ctx.channel.history(limit=None, oldest_first=True):
-                msgs.append(m)
-            if not msgs:
-                await ctx.send("❌ Keine Nachrichten.")
-                return
-            lines = [f"Transkript - {ctx.channel.name}", f"Server: {ctx.guild.name}", f"Zeit: {datetime.datetime.now().strftime('%d.%m.%Y %H:%M')}", "=" * 40, ""]
-            for m in msgs:
-                lines.append(f"[{m.created_at.strftime('%d.%m.%Y %H:%M')}] {m.author}: {m.content or '[Medien]'}")
-            await ctx.send(file=discord.File(fp="\n".join(lines).encode("utf-8"), filename=f"transcript_{ctx.channel.name}.txt"))
+            await self.run_transcript(ctx.channel, ctx.send, komprimiert, art.lower() == "html")
 
     @ticket.command(name="info")
     async def t_info(self, ctx):
         """Zeigt Ticket-Info"""
-        tickets = await self.config.guild(ctx.guild).tickets()
-        if str(ctx.channel.id) not in tickets:
+        t = self.tindex(ctx.guild).get(ctx.channel.id)
+        if t is None:
             await ctx.send("❌ Kein Ticket.")
             return
-        t = tickets[str(ctx.channel.id)]
         u = ctx.guild.get_member(t.get("user_id")) or await self.bot.fetch_user(t.get("user_id"))
-        e = Embed(title="📋 Ticket-Info", color=Color(await self.config.guild(ctx.guild).embed_color()))
+        e = Embed(title="📋 Ticket-Info", color=Color((await self.settings(ctx.guild)).embed_color))
         e.add_field(name="Ersteller", value=f"{u.mention}\n{u} ({u.id})", inline=False)
         e.add_field(name="Kategorie", value=t.get("category", "?"), inline=True)
         e.add_field(name="Status", value=t.get("status", "open"), inline=True)
@@ -616,21 +1565,70 @@ class LFBBotTicketTool(commands.Cog):
             e.add_field(name="Claim", value=c.mention if c else f"<@{t['claim_by']}>", inline=True)
         await ctx.send(embed=e)
 
+    @ticket.command(name="search", aliases=["suche"])
+    async def t_search(self, ctx, *, suche: str):
+        """Durchsucht geschlossene Transkripte (Filter: kategorie=, user=, seit=7d, seite=2)"""
+        if not await self.is_support(ctx.author):
+            await ctx.send("❌ Keine Berechtigung.")
+            return
+        if not self.store.fts:
+            await ctx.send("❌ Volltextsuche ist auf diesem System nicht verfügbar (SQLite ohne FTS5).")
+            return
+        try:
+            terms, opts = parse_search(suche)
+        except ValueError as e:
+            await ctx.send(f"❌ {e}")
+            return
+        match = fts_query(terms)
+        if match is None:
+            await ctx.send("❌ Kein Suchbegriff.")
+            return
+        page = opts.pop("page")
+        if "since" in opts:
+            opts["since"] = time.time() - opts["since"]
+        hits, more = await self.store.search_transcripts(ctx.guild.id, match, SEARCH_PAGE_SIZE, (page - 1) * SEARCH_PAGE_SIZE, **opts)
+        if not hits:
+            await ctx.send("❌ Keine Treffer." if page == 1 else "❌ Keine weiteren Treffer.")
+            return
+        e = Embed(title=f"🔎 {' '.join(terms)}"[:256], color=Color.blue())
+        for h in hits:
+            when = f" · <t:{int(h['closed_at'])}:d>" if h["closed_at"] else ""
+            e.add_field(name=f"#{h['number']} · {h['category']}", value=f"<@{h['user_id']}>{when}\n{h['snippet']}"[:1024], inline=False)
+        e.set_footer(text=f"Seite {page}" + (f" · weiter mit seite={page + 1}" if more else ""))
+        await ctx.send(embed=e)
+
     @ticket.command(name="stats")
-    async def t_stats(self, ctx, user: Member = None):
-        """Zeigt Statistiken"""
-        tickets = await self.config.guild(ctx.guild).tickets()
+    async def t_stats(self, ctx, user: Optional[Member] = None, zeitraum: Optional[str] = None):
+        """Zeigt Statistiken (zeitraum: z.B. 24h, 7d, 4w)"""
+        span = parse_duration(zeitraum)
+        if zeitraum and span is None:
+            await ctx.send("❌ Ungültiger Zeitraum. Beispiele: `24h`, `7d`, `4w`")
+            return
+        st = self.tstats(ctx.guild.id)
         if user:
-            ut = [t for t in tickets.values() if t.get("user_id") == user.id]
+            total = st.get("user", user.id)
+            opened = self.tindex(ctx.guild).open_count(user.id)
             e = Embed(title=f"📊 Stats für {user}", color=Color.blue())
-            e.add_field(name="Gesamt", value=str(len(ut)), inline=True)
-            e.add_field(name="Offen", value=str(len([t for t in ut if t.get("status") == "open"])), inline=True)
-            e.add_field(name="Geschlossen", value=str(len([t for t in ut if t.get("status") == "closed"])), inline=True)
+            e.add_field(name="Gesamt", value=str(total), inline=True)
+            e.add_field(name="Offen", value=str(opened), inline=True)
+            e.add_field(name="Geschlossen", value=str(max(total - opened, 0)), inline=True)
+            if st.get("claimer", user.id):
+                e.add_field(name="Geclaimt", value=str(st.get("claimer", user.id)), inline=True)
         else:
             e = Embed(title="📊 Server Stats", color=Color.blue())
-            e.add_field(name="Gesamt", value=str(len(tickets)), inline=True)
-            e.add_field(name="Offen", value=str(len([t for t in tickets.values() if t.get("status") == "open"])), inline=True)
-            e.add_field(name="Geschlossen", value=str(len([t for t in tickets.values() if t.get("status") == "closed"])), inline=True)
+            e.add_field(name="Gesamt", value=str(st.total()), inline=True)
+            e.add_field(name="Offen", value=str(st.get("status", "open")), inline=True)
+            e.add_field(name="Geschlossen", value=str(st.get("status", "closed")), inline=True)
+            cats = st.top("category")
+            if cats:
+                e.add_field(name="Kategorien", value="\n".join(f"{k}: {v}" for k, v in cats), inline=True)
+            claimers = st.top("claimer")
+            if claimers:
+                e.add_field(name="Top Claimer", value="\n".join(f"<@{k}>: {v}" for k, v in claimers), inline=True)
+        if span:
+            now = time.time()
+            created, closed = st.window(now - span, now)
+            e.add_field(name=f"Letzte {zeitraum}", value=f"Erstellt: {created}\nGeschlossen: {closed}", inline=False)
         await ctx.send(embed=e)
 
     # === ADMIN COMMANDS ===
@@ -728,6 +1726,60 @@ class LFBBotTicketTool(commands.Cog):
             await self.config.guild(ctx.guild).log_channel.set(channel.id)
             await ctx.send(f"✅ Log: {channel.mention}")
 
+    @ticketset.command(name="logbacklog", aliases=["logrueckstau"])
+    async def ts_logbacklog(self, ctx, anzahl: int):
+        """Maximale Anzahl wartender Log-Ereignisse, darüber wird zusammengefasst"""
+        if anzahl < 1:
+            await ctx.send("❌ Mindestens 1.")
+            return
+        await self.config.guild(ctx.guild).log_backlog.set(anzahl)
+        await ctx.send(f"✅ Log-Rückstau: {anzahl} (aktuell {self.logs.pending(ctx.guild.id)} wartend)")
+
+    @ticketset.command(name="pool")
+    async def ts_pool(self, ctx, anzahl: int):
+        """Anzahl vorab angelegter, versteckter Ticket-Channels (0 = aus)"""
+        if not 0 <= anzahl <= POOL_MAX:
+            await ctx.send(f"❌ Zwischen 0 und {POOL_MAX}.")
+            return
+        await self.config.guild(ctx.guild).pool_size.set(anzahl)
+        await ctx.send(f"✅ Channel-Pool: {anzahl}" if anzahl else "✅ Channel-Pool aus")
+
+    @ticketset.command(name="retention", aliases=["aufbewahrung"])
+    async def ts_retention(self, ctx, tage: int):
+        """Tage, die geschlossene Tickets aktiv bleiben, danach ins Archiv (0 = nie archivieren)"""
+        if tage < 0:
+            await ctx.send("❌ Muss positiv sein.")
+            return
+        await self.config.guild(ctx.guild).retention_days.set(tage)
+        await ctx.send(f"✅ Aufbewahrung: {tage} Tage" if tage else "✅ Archivierung aus")
+
+    @ticketset.command(name="archive", aliases=["archiv"])
+    async def ts_archive(self, ctx, suche: Union[Member, User, int]):
+        """Sucht archivierte Tickets nach Nummer oder User"""
+        if isinstance(suche, int):
+            segments = await self.store.archive_lookup(ctx.guild.id, number=suche)
+        else:
+            segments = await self.store.archive_lookup(ctx.guild.id, user_id=suche.id)
+        if not segments:
+            await ctx.send("❌ Nichts im Archiv gefunden.")
+            return
+        tickets = await self.render.run(self.archive.find, ctx.guild.id, segments)
+        e = Embed(title="🗄️ Archiv", color=Color.blue())
+        for t in tickets[:10]:
+            closed = parse_ts(t.get("closed_at"))
+            lines = [
+                f"User: <@{t.get('user_id')}>",
+                f"Kategorie: {t.get('category')}",
+                f"Geschlossen: <t:{int(closed)}:f>" if closed else "Geschlossen: ?",
+                f"Grund: {t.get('close_reason', '-')}",
+            ]
+            if t.get("transcript"):
+                lines.append(f"Transkript: `{t['transcript']}`")
+            e.add_field(name=f"#{t.get('number')} ({t.get('channel_id')})", value="\n".join(lines)[:1024], inline=False)
+        if len(tickets) > 10:
+            e.set_footer(text=f"{len(tickets) - 10} weitere")
+        await ctx.send(embed=e)
+
     @ticketset.command(name="autoclose")
     async def ts_autoclose(self, ctx, stunden: int):
         """Auto-Close in Stunden (0 = aus)"""
@@ -740,6 +1792,18 @@ class LFBBotTicketTool(commands.Cog):
         else:
             await ctx.send(f"✅ Auto-Close nach {stunden}h.")
 
+    @ticketset.command(name="autoclosewarn", aliases=["autoclosewarnung"])
+    async def ts_autoclosewarn(self, ctx, stunden: int):
+        """Warnung vor Auto-Close in Stunden (0 = aus)"""
+        if stunden < 0:
+            await ctx.send("❌ Muss positiv sein.")
+            return
+        await self.config.guild(ctx.guild).auto_close_warning_hours.set(stunden)
+        if stunden == 0:
+            await ctx.send("✅ Auto-Close-Warnung deaktiviert.")
+        else:
+            await ctx.send(f"✅ Warnung {stunden}h vor Auto-Close.")
+
     @ticketset.command(name="color", aliases=["farbe"])
     async def ts_color(self, ctx, color: str):
         """Setzt Embed-Farbe (Hex, z.B. #3498db)"""
@@ -790,14 +1854,194 @@ class LFBBotTicketTool(commands.Cog):
         d = await self.config.guild(ctx.guild).all()
         e = Embed(title="📋 Einstellungen", color=Color(d.get("embed_color", 0x3498db)))
         cat = ctx.guild.get_channel(d.get("ticket_category")) if d.get("ticket_category") else None
-        e.add_field(name="Kategorie", value=cat.mention if cat else "Keine", inline=True)
+        overflow = sum(len(ids) for ids in d.get("overflow_categories", {}).values())
+        e.add_field(name="Kategorie", value=(cat.mention if cat else "Keine") + (f" (+{overflow} Überlauf)" if overflow else ""), inline=True)
         srs = [ctx.guild.get_role(r) for r in d.get("support_roles", []) if ctx.guild.get_role(r)]
         e.add_field(name="Support-Rollen", value=humanize_list([r.mention for r in srs]) if srs else "Keine", inline=False)
         e.add_field(name="Limit", value=str(d.get("ticket_limit", 3)), inline=True)
-        e.add_field(name="Auto-Close", value=f"{d.get('auto_close_hours', 72)}h", inline=True)
+        e.add_field(name="Auto-Close", value=f"{d.get('auto_close_hours', 72)}h (Warnung {d.get('auto_close_warning_hours', 24)}h vorher)", inline=True)
         e.add_field(name="Claim", value="✅" if d.get("claim_enabled") else "❌", inline=True)
         e.add_field(name="Feedback", value="✅" if d.get("feedback_enabled") else "❌", inline=True)
         e.add_field(name="DM", value="✅" if d.get("dm_notifications") else "❌", inline=True)
+        e.add_field(name="Aufbewahrung", value=f"{d.get('retention_days', 30)} Tage" if d.get("retention_days", 30) else "unbegrenzt", inline=True)
+        ready, size, hits, misses = self.pool.stats(ctx.guild.id)
+        if size:
+            rate = f"{hits / (hits + misses):.0%}" if hits + misses else "-"
+            e.add_field(name="Channel-Pool", value=f"{ready}/{size} bereit · Trefferquote {rate} ({hits}/{hits + misses})", inline=True)
+        else:
+            e.add_field(name="Channel-Pool", value="❌", inline=True)
+        await ctx.send(embed=e)
+
+    @ticketset.command(name="feedbackstats", aliases=["bewertungen"])
+    async def ts_feedbackstats(self, ctx, zeitraum: Optional[str] = None):
+        """Zeigt die Zufriedenheit nach Kategorie und Team-Mitglied (zeitraum: z.B. 7d, 4w)"""
+        span = parse_duration(zeitraum)
+        if zeitraum and span is None:
+            await ctx.send("❌ Ungültiger Zeitraum. Beispiele: `24h`, `7d`, `4w`")
+            return
+        fb = self.tfeedback(ctx.guild.id)
+        e = Embed(title="⭐ Feedback", color=Color.gold())
+        e.add_field(name="Gesamt", value=format_hist(fb.get("all")), inline=False)
+        if span:
+            now = time.time()
+            e.add_field(name=f"Letzte {zeitraum}", value=format_hist(fb.window(now - span, now)), inline=False)
+        cats = fb.ranked("category")
+        if cats:
+            e.add_field(name="Je Kategorie", value="\n".join(f"**{k}**: {format_hist(h)}" for k, h in cats), inline=False)
+        staff = fb.ranked("staff")
+        if staff:
+            e.add_field(name="Je Team-Mitglied", value="\n".join(f"<@{k}>: {format_hist(h)}" for k, h in staff), inline=False)
+        await ctx.send(embed=e)
+
+    @ticketset.command(name="sla")
+    async def ts_sla(self, ctx):
+        """Zeigt Erstantwort- und Lösungszeiten (p50/p90/p99)"""
+        sla = self.tsla(ctx.guild.id)
+        e = Embed(title="⏱️ SLA", color=Color.blue())
+
+        def line(sk):
+            return f"p50 {format_seconds(sk.quantile(0.5))} · p90 {format_seconds(sk.quantile(0.9))} · p99 {format_seconds(sk.quantile(0.99))} ({sk.count})"
+
+        for metric, label in (("first_response", "Erstantwort"), ("resolution", "Lösung")):
+            total = sla.get(metric)
+            if not total:
+                e.add_field(name=label, value="Keine Daten", inline=False)
+                continue
+            e.add_field(name=label, value=line(total), inline=False)
+            cats = sla.scoped(metric, "category")[:5]
+            if cats:
+                e.add_field(name=f"{label} je Kategorie", value="\n".join(f"**{k}**: {line(sk)}" for k, sk in cats), inline=False)
+            staff = sla.scoped(metric, "staff")[:5]
+            if staff:
+                e.add_field(name=f"{label} je Team-Mitglied", value="\n".join(f"<@{k}>: {line(sk)}" for k, sk in staff), inline=False)
+        await ctx.send(embed=e)
+
+    @ticketset.command(name="statsrebuild", aliases=["statsneu"])
+    async def ts_statsrebuild(self, ctx):
+        """Berechnet die Statistik-Zähler aus den gespeicherten Tickets neu"""
+        async with ctx.typing():
+            await self.rebuild_stats(ctx.guild.id)
+        await ctx.send(f"✅ Statistiken neu berechnet ({self.tstats(ctx.guild.id).total()} Tickets).")
+
+    @ticketset.command(name="latency", aliases=["latenz"])
+    async def ts_latency(self, ctx):
+        """Zeigt die Dauer der Schritte beim Erstellen von Tickets"""
+        if not self._step_times:
+            await ctx.send("Noch keine Messwerte.")
+            return
+        e = Embed(title="⏱️ Ticket-Erstellung", color=Color.blue())
+        for name, samples in sorted(self._step_times.items(), key=lambda kv: -sum(kv[1]) / len(kv[1])):
+            ordered = sorted(samples)
+            e.add_field(
+                name=name,
+                value=f"Ø {sum(ordered) / len(ordered) * 1000:.0f} ms\np50 {ordered[len(ordered) // 2] * 1000:.0f} ms\nmax {ordered[-1] * 1000:.0f} ms\n({len(ordered)} Werte)",
+                inline=True,
+            )
+        e.add_field(name="Event-Loop", value=f"max. Verzögerung {self.lag.max_lag * 1000:.0f} ms\n{self.lag.stalls}× über {self.lag.threshold * 1000:.0f} ms", inline=False)
+        await ctx.send(embed=e)
+
+    async def _bulk_begin(self, ctx, kind, kriterien, status, reason=None):
+        if ctx.guild.id in self._bulk_runs:
+            await ctx.send("❌ Es gibt bereits eine Massenaktion. Nutze `bulkresume` oder `bulkcancel verwerfen`.")
+            return
+        try:
+            flt = BulkFilter.parse(kriterien, status)
+        except ValueError as e:
+            await ctx.send(f"❌ {e}")
+            return
+        targets = flt.select(self.tindex(ctx.guild), time.time())
+        if not targets:
+            await ctx.send("❌ Keine passenden Tickets.")
+            return
+        run = {"kind": kind, "filter": flt.describe(), "targets": targets, "total": len(targets), "done": 0, "skipped": 0, "actor": ctx.author.id, "reason": reason}
+        if kind == "export":
+            path = cog_data_path(self) / "exports" / str(ctx.guild.id) / f"export-{datetime.datetime.now().strftime('%Y%m%d-%H%M%S')}.txt.gz"
+            path.parent.mkdir(parents=True, exist_ok=True)
+            run["export"] = str(path)
+        self._bulk_runs[ctx.guild.id] = run
+        await self.store.save_bulk_run(ctx.guild.id, run)
+        status_msg = await ctx.send(f"⏳ {len(targets)} Tickets werden bearbeitet (Filter: {run['filter']})")
+        self.start_bulk(ctx.guild, run, status_msg)
+
+    @ticketset.command(name="bulkclose", aliases=["massenschliessen"])
+    async def ts_bulkclose(self, ctx, *kriterien: str):
+        """Schließt alle passenden Tickets, z.B. `kategorie=Support inaktiv=7d claimed=nein bestätigen`
+
+        Filter: kategorie, alter, inaktiv, claimed (ja/nein), user, status (open/closed/alle).
+        Ohne `bestätigen` am Ende wird nur die Anzahl angezeigt.
+        """
+        confirmed = bool(kriterien) and kriterien[-1] == "bestätigen"
+        if confirmed:
+            kriterien = kriterien[:-1]
+        if not confirmed:
+            try:
+                n = len(BulkFilter.parse(kriterien).select(self.tindex(ctx.guild), time.time()))
+            except ValueError as e:
+                await ctx.send(f"❌ {e}")
+                return
+            await ctx.send(f"⚠️ {n} Tickets passen. Zum Schließen den Befehl mit `bestätigen` am Ende wiederholen.")
+            return
+        await self._bulk_begin(ctx, "close", kriterien, "open", reason="Massenschließung")
+
+    @ticketset.command(name="bulkexport", aliases=["massenexport"])
+    async def ts_bulkexport(self, ctx, *kriterien: str):
+        """Exportiert die Transkripte aller passenden Tickets in eine .gz-Datei
+
+        Filter wie bei `bulkclose`, ohne `status` werden offene und geschlossene Tickets exportiert.
+        """
+        await self._bulk_begin(ctx, "export", kriterien, None)
+
+    @ticketset.command(name="bulkcancel", aliases=["massenabbruch"])
+    async def ts_bulkcancel(self, ctx, verwerfen: str = None):
+        """Hält die laufende Massenaktion an (`verwerfen` löscht sie ganz)"""
+        task = self._bulk_tasks.get(ctx.guild.id)
+        if task:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+        run = self._bulk_runs.get(ctx.guild.id)
+        if run is None:
+            await ctx.send("❌ Keine Massenaktion.")
+            return
+        if verwerfen == "verwerfen":
+            self._bulk_runs.pop(ctx.guild.id, None)
+            await self.store.save_bulk_run(ctx.guild.id, None)
+            await ctx.send(f"✅ Massenaktion verworfen ({run['done']}/{run['total']} erledigt).")
+        else:
+            await ctx.send(f"⏸️ Angehalten bei {run['done']}/{run['total']}. Fortsetzen mit `bulkresume`.")
+
+    @ticketset.command(name="bulkresume", aliases=["massenfortsetzen"])
+    async def ts_bulkresume(self, ctx):
+        """Setzt eine angehaltene oder unterbrochene Massenaktion fort"""
+        run = self._bulk_runs.get(ctx.guild.id)
+        if run is None:
+            await ctx.send("❌ Keine Massenaktion.")
+            return
+        if ctx.guild.id in self._bulk_tasks:
+            await ctx.send("❌ Läuft bereits.")
+            return
+        status_msg = await ctx.send(f"⏳ Fortsetzung bei {run['done']}/{run['total']} (Filter: {run['filter']})")
+        self.start_bulk(ctx.guild, run, status_msg)
+
+    @ticketset.command(name="queue", aliases=["warteschlange"])
+    async def ts_queue(self, ctx):
+        """Zeigt Auslastung und Wartezeiten der Discord-Warteschlange"""
+        e = Embed(title="🚦 Warteschlange", color=Color.blue())
+        for prio, label in PRIORITY_NAMES.items():
+            waits = sorted(self.work.waits[prio])
+            if waits:
+                timing = f"Ø {sum(waits) / len(waits) * 1000:.0f} ms · p95 {waits[int(len(waits) * 0.95)] * 1000:.0f} ms · max {waits[-1] * 1000:.0f} ms"
+            else:
+                timing = "keine Messwerte"
+            e.add_field(name=label, value=f"Wartend: {self.work.pending[prio]} · Erledigt: {self.work.done[prio]}\n{timing}", inline=False)
+        e.add_field(name="Geplante Aufträge", value=str(len(self.jobs)), inline=False)
+        e.add_field(name="Wartende Ticket-Erstellungen", value=f"{self.admission.waiting(ctx.guild.id)}/{self.admission.queue}", inline=False)
+        routes = self.work.routes()
+        if routes:
+            e.add_field(
+                name="Routen",
+                value="\n".join(f"`{name}`: {active}/{limit} aktiv, {parked} geparkt, {retries}× 429" for name, (active, limit, parked, retries) in sorted(routes.items())),
+                inline=False,
+            )
         await ctx.send(embed=e)
 
     # === KATEGORIEN ===
@@ -850,9 +2094,25 @@ class LFBBotTicketTool(commands.Cog):
         e = Embed(title="📋 Kategorien", color=Color(await self.config.guild(ctx.guild).embed_color()))
         for n, d in cats.items():
             st = "✅" if d.get("enabled", True) else "❌"
-            e.add_field(name=f"{st} {d.get('emoji', '🎫')} {n}", value=d.get("description", "?"), inline=False)
+            parent = ctx.guild.get_channel(d["parent"]) if d.get("parent") else None
+            value = d.get("description", "?") + (f"\nDiscord-Kategorie: {parent.mention}" if parent else "")
+            e.add_field(name=f"{st} {d.get('emoji', '🎫')} {n}", value=value, inline=False)
         await ctx.send(embed=e)
 
+    @ts_cats.command(name="parent", aliases=["discordkategorie"])
+    async def cats_parent(self, ctx, name: str, category: CategoryChannel = None):
+        """Eigene Discord-Kategorie für eine Ticket-Kategorie (ohne Angabe: Standard-Kategorie)"""
+        cats = await self.config.guild(ctx.guild).categories()
+        if name not in cats:
+            await ctx.send("❌ Nicht gefunden.")
+            return
+        if category is None:
+            cats[name].pop("parent", None)
+        else:
+            cats[name]["parent"] = category.id
+        await self.config.guild(ctx.guild).categories.set(cats)
+        await ctx.send(f"✅ '{name}' nutzt {category.mention if category else 'die Standard-Kategorie'}. Volle Kategorien werden automatisch erweitert.")
+
     # === PANELS ===
     @ticketset.group(name="panel")
     async def ts_panel(self, ctx):
@@ -956,5 +2216,19 @@ class LFBBotTicketTool(commands.Cog):
         if confirm != "bestätigen":
             await ctx.send("⚠️ Nutze: `[p]ticketset reset bestätigen`")
             return
+        task = self._bulk_tasks.get(ctx.guild.id)
+        if task:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+        self._bulk_runs.pop(ctx.guild.id, None)
+        self.jobs.forget_guild(ctx.guild.id)
         await self.config.guild(ctx.guild).clear()
+        await self.store.delete_guild(ctx.guild.id)
+        self.counters.forget(ctx.guild.id)
+        self._stats.pop(ctx.guild.id, None)
+        self._sla.pop(ctx.guild.id, None)
+        self._feedback.pop(ctx.guild.id, None)
+        self.deadlines.cancel_guild(ctx.guild.id)
+        self.tindex(ctx.guild).load({})
+        await self.render.run(shutil.rmtree, self.archive.root / str(ctx.guild.id), True)
         await ctx.send("✅ Zurückgesetzt.")
@@ -0,0 +1,64 @@
+"""
+Zulassung - Token-Bucket pro Guild mit begrenzter Warteschlange für Ticket-Erstellungen.
+"""
+
+import asyncio
+import time
+from typing import Dict
+
+
+class _Bucket:
+    __slots__ = ("tokens", "updated", "waiting", "lock")
+
+    def __init__(self, tokens: float):
+        self.tokens = tokens
+        self.updated = time.monotonic()
+        self.waiting = 0
+        self.lock = asyncio.Lock()
+
+
+class AdmissionLimiter:
+    """Erlaubt ``burst`` Erstellungen sofort, danach ``rate`` pro Sekunde.
+
+    Bis zu ``queue`` Anfragen warten der Reihe nach auf ein Token, weitere werden abgelehnt.
+    Jede Guild hat ihren eigenen Bucket, ein Ansturm bremst also nur die eigene Guild.
+    """
+
+    def __init__(self, rate: float = 0.5, burst: int = 5, queue: int = 20):
+        self.rate = rate
+        self.burst = burst
+        self.queue = queue
+        self._buckets: Dict[int, _Bucket] = {}
+
+    def _refill(self, b: _Bucket):
+        now = time.monotonic()
+        b.tokens = min(self.burst, b.tokens + (now - b.updated) * self.rate)
+        b.updated = now
+
+    def waiting(self, gid: int) -> int:
+        b = self._buckets.get(gid)
+        return b.waiting if b else 0
+
+    async def acquire(self, gid: int) -> bool:
+        """Wartet auf ein Token, False wenn die Warteschlange voll ist."""
+        b = self._buckets.get(gid)
+        if b is None:
+            b = self._buckets[gid] = _Bucket(self.burst)
+        self._refill(b)
+        if not b.waiting and b.tokens >= 1:
+            b.tokens -= 1
+            return True
+        if b.waiting >= self.queue:
+            return False
+        b.waiting += 1
+        try:
+            # asyncio.Lock weckt Wartende in Ankunftsreihenfolge
+            async with b.lock:
+                while True:
+                    self._refill(b)
+                    if b.tokens >= 1:
+                        b.tokens -= 1
+                        return True
+                    await asyncio.sleep((1 - b.tokens) / self.rate)
+        finally:
+            b.waiting -= 1
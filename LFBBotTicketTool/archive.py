@@ -0,0 +1,88 @@
+"""
+Ticket-Archiv - geschlossene Tickets als gzip-komprimierte JSON-Lines-Segmente pro Guild und Monat.
+"""
+
+import datetime
+import gzip
+import json
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from .stats import parse_ts
+
+
+def closed_ts(tdata: dict) -> Optional[float]:
+    """Zeitpunkt der Schließung; ältere und migrierte Tickets ohne ``closed_at`` nutzen die letzte Aktivität bzw. die Erstellung."""
+    for key in ("closed_at", "last_activity", "created_ts", "created_at"):
+        ts = parse_ts(tdata.get(key))
+        if ts:
+            return ts
+    return None
+
+
+def select_expired(tickets: Iterable[dict], cutoff: float) -> List[dict]:
+    """Geschlossene Tickets, deren Schließung vor ``cutoff`` liegt."""
+    return [t for t in tickets if t.get("status") == "closed" and (closed_ts(t) or cutoff) < cutoff]
+
+
+def segment_name(tdata: dict) -> str:
+    """Monat der Schließung (UTC) als Segmentname, z.B. ``2024-05``."""
+    return datetime.datetime.fromtimestamp(closed_ts(tdata) or 0, datetime.timezone.utc).strftime("%Y-%m")
+
+
+class TicketArchive:
+    """Nur anhängende Segmente unter ``root/{guild_id}/{YYYY-MM}.jsonl.gz``.
+
+    Jedes Anhängen schreibt ein eigenes gzip-Member, bestehende Daten werden nie
+    neu geschrieben. Doppelt angehängte Tickets (z.B. nach einem Absturz) werden
+    beim Lesen über die Channel-ID zusammengefasst, der letzte Eintrag gilt.
+    """
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+
+    def path(self, gid: int, segment: str) -> Path:
+        return self.root / str(gid) / f"{segment}.jsonl.gz"
+
+    def append(self, gid: int, tickets: Iterable[dict]) -> Dict[str, List[dict]]:
+        """Schreibt die Tickets in ihre Monats-Segmente, gibt Segment -> Tickets zurück."""
+        by_segment: Dict[str, List[dict]] = {}
+        for t in tickets:
+            by_segment.setdefault(segment_name(t), []).append(t)
+        for segment, items in by_segment.items():
+            path = self.path(gid, segment)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with gzip.open(path, "ab") as f:
+                for t in items:
+                    f.write(json.dumps(t, separators=(",", ":")).encode("utf-8") + b"\n")
+        return by_segment
+
+    def read(self, gid: int, segment: str) -> Iterator[dict]:
+        path = self.path(gid, segment)
+        if not path.is_file():
+            return
+        with gzip.open(path, "rb") as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+    def find(self, gid: int, segments: Dict[str, set]) -> List[dict]:
+        """Tickets aus den angegebenen Segmenten (Segment -> Channel-IDs), nur diese Dateien werden gelesen."""
+        found: Dict[int, dict] = {}
+        for segment, cids in segments.items():
+            for t in self.read(gid, segment):
+                if t.get("channel_id") in cids:
+                    found[t["channel_id"]] = t
+        return sorted(found.values(), key=lambda t: t.get("number") or 0)
+
+    def iter_guild(self, gid: int) -> Iterator[dict]:
+        """Alle archivierten Tickets einer Guild, z.B. für das Neuberechnen der Statistiken."""
+        seen = set()
+        d = self.root / str(gid)
+        if not d.is_dir():
+            return
+        for path in sorted(d.glob("*.jsonl.gz"), reverse=True):
+            for t in reversed(list(self.read(gid, path.name[: -len(".jsonl.gz")]))):
+                if t.get("channel_id") not in seen:
+                    seen.add(t.get("channel_id"))
+                    yield t
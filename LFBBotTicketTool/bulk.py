@@ -0,0 +1,84 @@
+"""
+Massenaktionen - Filter für Tickets und Zustand unterbrechbarer Läufe.
+"""
+
+from dataclasses import asdict, dataclass
+from typing import Iterable, List, Optional
+
+from .stats import parse_duration, parse_ts
+
+# Tickets pro Schreibvorgang und gleichzeitig bearbeitete Tickets
+BULK_BATCH = 25
+BULK_CONCURRENCY = 4
+
+_YES = {"ja", "yes", "true", "1"}
+_NO = {"nein", "no", "false", "0"}
+
+
+@dataclass(frozen=True)
+class BulkFilter:
+    category: Optional[str] = None
+    min_age: Optional[int] = None
+    claimed: Optional[bool] = None
+    user_id: Optional[int] = None
+    inactive: Optional[int] = None
+    status: Optional[str] = "open"
+
+    @classmethod
+    def parse(cls, tokens: Iterable[str], status: Optional[str] = "open") -> "BulkFilter":
+        """``kategorie=Support alter=7d claimed=nein user=123 inaktiv=3d status=alle``, ValueError bei Fehlern."""
+        opts = {"status": status}
+        for tok in tokens:
+            key, sep, value = tok.partition("=")
+            key = key.lower()
+            if not sep or not value:
+                raise ValueError(f"Ungültiger Filter `{tok}`, erwartet `name=wert`.")
+            if key in ("kategorie", "category"):
+                opts["category"] = value
+            elif key in ("alter", "age", "inaktiv", "inactive"):
+                secs = parse_duration(value)
+                if secs is None:
+                    raise ValueError(f"Ungültige Dauer `{value}`. Beispiele: `24h`, `7d`, `4w`")
+                opts["min_age" if key in ("alter", "age") else "inactive"] = secs
+            elif key == "claimed":
+                if value.lower() not in _YES | _NO:
+                    raise ValueError("`claimed` erwartet `ja` oder `nein`.")
+                opts["claimed"] = value.lower() in _YES
+            elif key == "user":
+                uid = value.strip("<@!>")
+                if not uid.isdigit():
+                    raise ValueError(f"Ungültiger User `{value}`.")
+                opts["user_id"] = int(uid)
+            elif key == "status":
+                if value.lower() not in ("open", "closed", "alle"):
+                    raise ValueError("`status` erwartet `open`, `closed` oder `alle`.")
+                opts["status"] = None if value.lower() == "alle" else value.lower()
+            else:
+                raise ValueError(f"Unbekannter Filter `{key}`.")
+        return cls(**opts)
+
+    def matches(self, tdata: dict, now: float) -> bool:
+        if self.status and tdata.get("status") != self.status:
+            return False
+        if self.category and tdata.get("category") != self.category:
+            return False
+        if self.user_id and tdata.get("user_id") != self.user_id:
+            return False
+        if self.claimed is not None and bool(tdata.get("claim_by")) != self.claimed:
+            return False
+        if self.min_age:
+            created = tdata.get("created_ts") or parse_ts(tdata.get("created_at"))
+            if created is None or now - created < self.min_age:
+                return False
+        if self.inactive:
+            last = tdata.get("last_activity")
+            if last is None or now - last < self.inactive:
+                return False
+        return True
+
+    def select(self, tickets: Iterable[dict], now: float) -> List[int]:
+        return sorted(t["channel_id"] for t in tickets if self.matches(t, now))
+
+    def describe(self) -> str:
+        parts = [f"{k}={v}" for k, v in asdict(self).items() if v is not None]
+        return " ".join(parts) or "alle"
@@ -0,0 +1,77 @@
+"""
+Ticket-Nummern - Hi/Lo-Vergabe aus im Voraus reservierten Blöcken.
+"""
+
+import asyncio
+import logging
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+
+log = logging.getLogger("red.lfbbottickettool")
+
+Reserve = Callable[[int, int], Awaitable[Tuple[int, int]]]
+
+
+class _GuildCounter:
+    __slots__ = ("next", "end", "spare", "task", "lock")
+
+    def __init__(self):
+        self.next = 1
+        self.end = 0
+        self.spare: Optional[Tuple[int, int]] = None
+        self.task: Optional[asyncio.Task] = None
+        self.lock = asyncio.Lock()
+
+
+class CounterAllocator:
+    """Vergibt Nummern aus dem Speicher, ohne pro Ticket zu schreiben.
+
+    ``reserve(guild_id, n)`` muss den Block dauerhaft reservieren und als
+    ``(erste, letzte)`` zurückgeben. Nach einem Neustart ungenutzte Nummern
+    eines Blocks entfallen, Nummern wiederholen sich nie. Der nächste Block
+    wird im Hintergrund geholt, sobald nur noch ``low_water`` übrig sind.
+    """
+
+    def __init__(self, reserve: Reserve, block: int = 50, low_water: int = 10):
+        self._reserve = reserve
+        self.block = block
+        self.low_water = low_water
+        self._guilds: Dict[int, _GuildCounter] = {}
+
+    async def allocate(self, gid: int) -> int:
+        c = self._guilds.get(gid)
+        if c is None:
+            c = self._guilds[gid] = _GuildCounter()
+        if c.next > c.end:
+            async with c.lock:
+                while c.next > c.end:
+                    if c.spare:
+                        (c.next, c.end), c.spare = c.spare, None
+                    elif c.task:
+                        await asyncio.wait([c.task])
+                    else:
+                        c.next, c.end = await self._reserve(gid, self.block)
+        num = c.next
+        c.next += 1
+        if c.end - c.next < self.low_water and c.spare is None and c.task is None:
+            c.task = asyncio.create_task(self._prefetch(gid, c))
+        return num
+
+    async def _prefetch(self, gid: int, c: _GuildCounter):
+        try:
+            c.spare = await self._reserve(gid, self.block)
+        except Exception as e:
+            log.warning(f"Nummernblock für Guild {gid} nicht reserviert: {e}")
+        finally:
+            c.task = None
+
+    def forget(self, gid: int):
+        c = self._guilds.pop(gid, None)
+        if c and c.task:
+            c.task.cancel()
+
+    async def close(self):
+        tasks = [c.task for c in self._guilds.values() if c.task]
+        for t in tasks:
+            t.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._guilds.clear()
@@ -0,0 +1,60 @@
+"""
+Feedback - Bewertungen pro Guild mit laufenden Summen und Histogrammen.
+"""
+
+from typing import Dict, List, Optional, Tuple
+
+from .stats import DAY
+
+RATINGS = (1, 2, 3, 4, 5)
+
+# (Dimension, Schlüssel, Bewertung, Änderung)
+FeedbackDelta = Tuple[str, str, int, int]
+
+
+def feedback_deltas(rating: int, category: Optional[str], claimer: Optional[int], ts: float) -> List[FeedbackDelta]:
+    out = [("all", "", rating, 1), ("day", str(int(ts // DAY)), rating, 1)]
+    if category:
+        out.append(("category", category, rating, 1))
+    if claimer:
+        out.append(("staff", str(claimer), rating, 1))
+    return out
+
+
+def hist_mean(hist: List[int]) -> Optional[float]:
+    n = sum(hist)
+    return sum(r * c for r, c in zip(RATINGS, hist)) / n if n else None
+
+
+def format_hist(hist: List[int]) -> str:
+    mean = hist_mean(hist)
+    if mean is None:
+        return "Keine Bewertungen"
+    return f"⌀ {mean:.2f} ⭐ ({sum(hist)}) · " + " ".join(f"{r}★{c}" for r, c in zip(RATINGS, hist))
+
+
+class FeedbackStats:
+    """Bewertungs-Histogramme gesamt, je Kategorie, je Claimer und je Tag."""
+
+    def __init__(self):
+        self.dims: Dict[str, Dict[str, List[int]]] = {}
+
+    def apply(self, deltas):
+        for dim, key, rating, delta in deltas:
+            hist = self.dims.setdefault(dim, {}).setdefault(key, [0] * len(RATINGS))
+            hist[rating - 1] += delta
+
+    def get(self, dim: str, key="") -> List[int]:
+        return self.dims.get(dim, {}).get(str(key), [0] * len(RATINGS))
+
+    def ranked(self, dim: str, n: int = 5) -> List[Tuple[str, List[int]]]:
+        return sorted(self.dims.get(dim, {}).items(), key=lambda kv: -sum(kv[1]))[:n]
+
+    def window(self, since: float, until: float) -> List[int]:
+        """Histogramm über die Tages-Buckets des Zeitraums."""
+        days = self.dims.get("day", {})
+        out = [0] * len(RATINGS)
+        for d in range(int(since // DAY), int(until // DAY) + 1):
+            for i, c in enumerate(days.get(str(d), ())):
+                out[i] += c
+        return out
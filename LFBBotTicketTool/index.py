@@ -0,0 +1,65 @@
+"""
+In-Memory-Index der Tickets pro Guild.
+"""
+
+from typing import Dict, Iterator, Optional, Set
+
+
+class TicketIndex:
+    """Channel -> Ticket, User -> offene Tickets."""
+
+    def __init__(self):
+        self.by_channel: Dict[int, dict] = {}
+        self.open_by_user: Dict[int, Set[int]] = {}
+
+    def load(self, tickets: Dict[str, dict]):
+        self.by_channel.clear()
+        self.open_by_user.clear()
+        for cid, tdata in tickets.items():
+            self.put(int(cid), tdata)
+
+    def __contains__(self, cid: int) -> bool:
+        return cid in self.by_channel
+
+    def __len__(self) -> int:
+        return len(self.by_channel)
+
+    def __iter__(self) -> Iterator[dict]:
+        return iter(self.by_channel.values())
+
+    def get(self, cid: int) -> Optional[dict]:
+        return self.by_channel.get(cid)
+
+    def open_count(self, uid: int) -> int:
+        return len(self.open_by_user.get(uid, ()))
+
+    def put(self, cid: int, tdata: dict):
+        self.remove(cid)
+        self.by_channel[cid] = tdata
+        self._link(cid, tdata)
+
+    def update(self, cid: int, **changes) -> Optional[dict]:
+        tdata = self.by_channel.get(cid)
+        if tdata is None:
+            return None
+        self._unlink(cid, tdata)
+        tdata.update(changes)
+        self._link(cid, tdata)
+        return tdata
+
+    def remove(self, cid: int) -> Optional[dict]:
+        tdata = self.by_channel.pop(cid, None)
+        if tdata is not None:
+            self._unlink(cid, tdata)
+        return tdata
+
+    def _link(self, cid: int, tdata: dict):
+        if tdata.get("status", "open") == "open" and tdata.get("user_id") is not None:
+            self.open_by_user.setdefault(tdata["user_id"], set()).add(cid)
+
+    def _unlink(self, cid: int, tdata: dict):
+        uid = tdata.get("user_id")
+        if uid is not None and uid in self.open_by_user:
+            self.open_by_user[uid].discard(cid)
+            if not self.open_by_user[uid]:
+                del self.open_by_user[uid]
@@ -0,0 +1,93 @@
+"""
+Aufträge - dauerhaft gespeicherte, verzögerte Aktionen (z.B. Channel löschen) mit einem einzigen Timer.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Awaitable, Callable, Dict, Optional, Set
+
+from .scheduler import DeadlineScheduler
+
+log = logging.getLogger("red.lfbbottickettool")
+
+MAX_ATTEMPTS = 6
+# Wartezeit vor dem n-ten Wiederholungsversuch: RETRY_BASE * 2^(n-1), höchstens RETRY_MAX
+RETRY_BASE = 30
+RETRY_MAX = 3600
+
+Handler = Callable[[dict], Awaitable[None]]
+
+
+class JobQueue:
+    """Aufträge liegen im Ticket-Speicher und überstehen Neustarts.
+
+    Alle Fristen teilen sich einen ``DeadlineScheduler``, nur fällige Aufträge
+    bekommen einen kurzlebigen Task. Fehlgeschlagene Aufträge werden mit
+    wachsender Pause wiederholt und nach ``MAX_ATTEMPTS`` verworfen.
+    """
+
+    def __init__(self, store, handlers: Dict[str, Handler]):
+        self._store = store
+        self._handlers = handlers
+        self._timers = DeadlineScheduler()
+        self._jobs: Dict[int, dict] = {}
+        self._running: Set[asyncio.Task] = set()
+
+    def __len__(self) -> int:
+        return len(self._jobs)
+
+    def _arm(self, job: dict):
+        self._jobs[job["id"]] = job
+        self._timers.set((job["guild_id"], job["id"]), job["due"], job["kind"])
+
+    async def load(self):
+        for job in await self._store.load_jobs():
+            self._arm(job)
+
+    async def schedule(self, guild_id: int, kind: str, target: int, delay: float = 0, payload: Optional[dict] = None) -> int:
+        job = {"guild_id": guild_id, "kind": kind, "target": target, "due": time.time() + delay, "attempts": 0, "payload": payload or {}}
+        job["id"] = await self._store.add_job(job)
+        self._arm(job)
+        return job["id"]
+
+    def forget_guild(self, guild_id: int):
+        """Verwirft die Aufträge einer Guild im Speicher, die Zeilen löscht ``delete_guild`` des Speichers."""
+        for job_id in [j for j, job in self._jobs.items() if job["guild_id"] == guild_id]:
+            del self._jobs[job_id]
+        self._timers.cancel_guild(guild_id)
+
+    async def run(self):
+        await self._timers.run(self._on_due)
+
+    async def _on_due(self, key, kind):
+        job = self._jobs.get(key[1])
+        if job is not None:
+            task = asyncio.create_task(self._execute(job))
+            self._running.add(task)
+            task.add_done_callback(self._running.discard)
+
+    async def _execute(self, job: dict):
+        handler = self._handlers.get(job["kind"])
+        try:
+            if handler is None:
+                raise KeyError(f"Unbekannter Auftrag {job['kind']}")
+            await handler(job)
+        except Exception as e:
+            job["attempts"] += 1
+            if job["attempts"] >= MAX_ATTEMPTS or handler is None:
+                log.warning(f"Auftrag {job['kind']} für {job['target']} verworfen: {e}")
+            else:
+                job["due"] = time.time() + min(RETRY_BASE * 2 ** (job["attempts"] - 1), RETRY_MAX)
+                await self._store.reschedule_job(job["id"], job["due"], job["attempts"])
+                self._arm(job)
+                return
+        self._jobs.pop(job["id"], None)
+        await self._store.delete_job(job["id"])
+
+    async def close(self):
+        tasks = list(self._running)
+        for t in tasks:
+            t.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._timers.clear()
@@ -0,0 +1,102 @@
+"""
+Log-Dispatcher - sammelt Log-Embeds pro Guild und sendet sie gebündelt.
+"""
+
+import asyncio
+import logging
+from collections import deque
+from typing import Awaitable, Callable, Deque, Dict, List, Optional
+
+import discord
+
+log = logging.getLogger("red.lfbbottickettool")
+
+# Discord erlaubt bis zu 10 Embeds pro Nachricht
+EMBEDS_PER_MESSAGE = 10
+
+
+class _GuildLog:
+    __slots__ = ("queue", "dropped", "task")
+
+    def __init__(self):
+        self.queue: Deque[discord.Embed] = deque()
+        self.dropped = 0
+        self.task: Optional[asyncio.Task] = None
+
+
+class LogDispatcher:
+    """Warteschlange pro Guild: Ereignisse werden ``window`` Sekunden gesammelt.
+
+    Über ``backlog`` hinaus werden Ereignisse verworfen und später als
+    Zusammenfassung gemeldet. Wiederholungen bei 429 sind Sache von ``send``
+    (im Cog die Discord-Warteschlange), ein fehlgeschlagener Block wird verworfen.
+    """
+
+    def __init__(
+        self,
+        resolve: Callable[[int], Awaitable[Optional[discord.abc.Messageable]]],
+        window: float = 2.0,
+        backlog: int = 200,
+        send: Optional[Callable[[discord.abc.Messageable, List[discord.Embed]], Awaitable]] = None,
+    ):
+        self._resolve = resolve
+        self._sendfn = send or (lambda channel, batch: channel.send(embeds=batch))
+        self.window = window
+        self.default_backlog = backlog
+        self._backlog: Dict[int, int] = {}
+        self._guilds: Dict[int, _GuildLog] = {}
+
+    def set_backlog(self, gid: int, backlog: int):
+        self._backlog[gid] = backlog
+
+    def pending(self, gid: int) -> int:
+        g = self._guilds.get(gid)
+        return len(g.queue) if g else 0
+
+    def enqueue(self, gid: int, embed: discord.Embed):
+        g = self._guilds.get(gid)
+        if g is None:
+            g = self._guilds[gid] = _GuildLog()
+        if len(g.queue) >= self._backlog.get(gid, self.default_backlog):
+            g.dropped += 1
+        else:
+            g.queue.append(embed)
+        if g.task is None:
+            g.task = asyncio.create_task(self._worker(gid, g))
+
+    async def _worker(self, gid: int, g: _GuildLog, delay: bool = True):
+        try:
+            if delay:
+                await asyncio.sleep(self.window)
+            while g.queue or g.dropped:
+                channel = await self._resolve(gid)
+                if channel is None:
+                    g.queue.clear()
+                    g.dropped = 0
+                    break
+                batch = [g.queue.popleft() for _ in range(min(EMBEDS_PER_MESSAGE, len(g.queue)))]
+                if g.dropped and len(batch) < EMBEDS_PER_MESSAGE:
+                    batch.append(discord.Embed(title="📋 Log-Rückstau", description=f"{g.dropped} Ereignisse wurden verworfen.", color=discord.Color.orange()))
+                    g.dropped = 0
+                await self._send(channel, batch)
+        finally:
+            g.task = None
+
+    async def _send(self, channel, batch: List[discord.Embed]):
+        try:
+            await self._sendfn(channel, batch)
+        except discord.HTTPException as e:
+            log.warning(f"Log verworfen ({len(batch)} Einträge): {e}")
+
+    async def close(self):
+        """Bricht wartende Sammelfenster ab und sendet den Rest sofort."""
+        for gid, g in list(self._guilds.items()):
+            if g.task:
+                g.task.cancel()
+                await asyncio.gather(g.task, return_exceptions=True)
+            if g.queue or g.dropped:
+                try:
+                    await asyncio.wait_for(self._worker(gid, g, delay=False), 10)
+                except (asyncio.TimeoutError, discord.HTTPException):
+                    pass
+        self._guilds.clear()
@@ -0,0 +1,122 @@
+"""
+Channel-Pool - vorab angelegte, versteckte Ticket-Channels pro Guild.
+"""
+
+import asyncio
+import logging
+from typing import Awaitable, Callable, Dict, List, Optional
+
+log = logging.getLogger("red.lfbbottickettool")
+
+# Sekunden zwischen zwei Channel-Erstellungen beim Auffüllen (Rate-Limit für Channel-Erstellung)
+REFILL_INTERVAL = 10.0
+
+
+class _GuildPool:
+    __slots__ = ("channels", "size", "hits", "misses", "task")
+
+    def __init__(self):
+        self.channels: List[int] = []
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.task: Optional[asyncio.Task] = None
+
+
+class ChannelPool:
+    """Hält bis zu ``size`` versteckte Channels bereit und füllt im Hintergrund gedrosselt nach.
+
+    ``create`` legt einen Pool-Channel an und gibt dessen ID zurück, ``delete`` entfernt
+    einen überzähligen, ``persist`` speichert die aktuelle Liste, ``ready`` wartet auf den Bot.
+    """
+
+    def __init__(
+        self,
+        create: Callable[[int], Awaitable[Optional[int]]],
+        delete: Callable[[int, int], Awaitable[None]],
+        persist: Callable[[int, List[int]], Awaitable[None]],
+        ready: Callable[[], Awaitable],
+        interval: float = REFILL_INTERVAL,
+    ):
+        self._create = create
+        self._delete = delete
+        self._persist = persist
+        self._ready = ready
+        self.interval = interval
+        self._guilds: Dict[int, _GuildPool] = {}
+
+    def _get(self, gid: int) -> _GuildPool:
+        g = self._guilds.get(gid)
+        if g is None:
+            g = self._guilds[gid] = _GuildPool()
+        return g
+
+    def load(self, gid: int, channel_ids: List[int]):
+        self._get(gid).channels = list(channel_ids)
+
+    def set_size(self, gid: int, size: int):
+        g = self._get(gid)
+        g.size = max(size, 0)
+        if len(g.channels) != g.size:
+            self._refill(gid, g)
+
+    def take(self, gid: int) -> Optional[int]:
+        """Nächster Pool-Channel oder None, zählt Treffer und Fehlschläge."""
+        g = self._guilds.get(gid)
+        if g is None or not g.size:
+            return None
+        cid = g.channels.pop(0) if g.channels else None
+        if cid is None:
+            g.misses += 1
+        else:
+            g.hits += 1
+        self._refill(gid, g)
+        return cid
+
+    def discard(self, gid: int, cid: int):
+        g = self._guilds.get(gid)
+        if g and cid in g.channels:
+            g.channels.remove(cid)
+            self._refill(gid, g)
+
+    def stats(self, gid: int) -> tuple:
+        """(bereit, Größe, Treffer, Fehlschläge)"""
+        g = self._guilds.get(gid)
+        return (len(g.channels), g.size, g.hits, g.misses) if g else (0, 0, 0, 0)
+
+    def _refill(self, gid: int, g: _GuildPool):
+        if g.task is None:
+            g.task = asyncio.create_task(self._worker(gid, g))
+
+    async def _worker(self, gid: int, g: _GuildPool):
+        try:
+            await self._ready()
+            failed = False
+            while True:
+                # Nach dem letzten Speichern folgt kein await mehr, Entnahmen per take() sind also immer gespeichert
+                await self._persist(gid, list(g.channels))
+                if failed:
+                    break
+                if len(g.channels) > g.size:
+                    await self._delete(gid, g.channels.pop())
+                elif len(g.channels) < g.size:
+                    cid = await self._create(gid)
+                    if cid is None:
+                        failed = True
+                    else:
+                        g.channels.append(cid)
+                        await asyncio.sleep(self.interval)
+                else:
+                    break
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            log.warning(f"Channel-Pool für Guild {gid} konnte nicht aufgefüllt werden: {e}")
+        finally:
+            g.task = None
+
+    async def close(self):
+        tasks = [g.task for g in self._guilds.values() if g.task]
+        for t in tasks:
+            t.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
@@ -0,0 +1,138 @@
+"""
+Deadline-Scheduler - Min-Heaps pro Guild, schläft bis zur nächsten fälligen Frist.
+"""
+
+import asyncio
+import heapq
+import itertools
+import time
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+Key = Tuple[int, int]  # (guild_id, channel_id)
+
+
+class _GuildDeadlines:
+    __slots__ = ("heap", "entries")
+
+    def __init__(self):
+        self.heap: List[Tuple[float, int, int]] = []
+        self.entries: Dict[int, Tuple[float, str]] = {}
+
+
+class DeadlineScheduler:
+    """Eine Frist mit Stufe (z.B. "warn"/"close") pro Ticket, gruppiert nach Guild.
+
+    Spätere Fristen werden nur in ``entries`` vermerkt und beim Herausnehmen
+    neu eingereiht, die Heaps wachsen also nicht mit jeder Aktivität. Ein
+    globaler Heap hält pro Guild nur deren nächste Frist.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.time):
+        self._clock = clock
+        self._guilds: Dict[int, _GuildDeadlines] = {}
+        self._top: List[Tuple[float, int, int]] = []
+        self._top_due: Dict[int, float] = {}
+        self._seq = itertools.count()
+        self._wake = asyncio.Event()
+
+    def __len__(self) -> int:
+        return sum(len(g.entries) for g in self._guilds.values())
+
+    def __contains__(self, key: Key) -> bool:
+        g = self._guilds.get(key[0])
+        return g is not None and key[1] in g.entries
+
+    def entry(self, key: Key) -> Optional[Tuple[float, str]]:
+        g = self._guilds.get(key[0])
+        return g.entries.get(key[1]) if g else None
+
+    def set(self, key: Key, due: float, stage: str = "close"):
+        gid, cid = key
+        g = self._guilds.get(gid)
+        if g is None:
+            g = self._guilds[gid] = _GuildDeadlines()
+        old = g.entries.get(cid)
+        g.entries[cid] = (due, stage)
+        if old is None or due < old[0]:
+            heapq.heappush(g.heap, (due, next(self._seq), cid))
+            self._push_guild(gid, due)
+
+    def cancel(self, key: Key):
+        g = self._guilds.get(key[0])
+        if g is not None:
+            g.entries.pop(key[1], None)
+
+    def cancel_guild(self, gid: int):
+        self._guilds.pop(gid, None)
+        self._top_due.pop(gid, None)
+
+    def clear(self):
+        self._guilds.clear()
+        self._top.clear()
+        self._top_due.clear()
+        self._wake.set()
+
+    def _push_guild(self, gid: int, due: float):
+        if due < self._top_due.get(gid, float("inf")):
+            self._top_due[gid] = due
+            heapq.heappush(self._top, (due, next(self._seq), gid))
+            if self._top[0][2] == gid:
+                self._wake.set()
+
+    @staticmethod
+    def _head(g: _GuildDeadlines) -> Optional[float]:
+        while g.heap:
+            due, _, cid = g.heap[0]
+            cur = g.entries.get(cid)
+            if cur is not None and cur[0] >= due:
+                return due
+            heapq.heappop(g.heap)
+        return None
+
+    def next_due(self) -> Optional[float]:
+        while self._top:
+            due, _, gid = self._top[0]
+            if self._top_due.get(gid) == due:
+                return due
+            heapq.heappop(self._top)
+        return None
+
+    def pop_due(self, now: float) -> List[Tuple[Key, str]]:
+        out = []
+        while True:
+            nxt = self.next_due()
+            if nxt is None or nxt > now:
+                return out
+            _, _, gid = heapq.heappop(self._top)
+            del self._top_due[gid]
+            g = self._guilds.get(gid)
+            if g is None:
+                continue
+            while g.heap and g.heap[0][0] <= now:
+                due, _, cid = heapq.heappop(g.heap)
+                cur = g.entries.get(cid)
+                if cur is None or cur[0] < due:
+                    continue  # abgebrochen oder bereits früher eingereiht
+                if cur[0] > due:
+                    heapq.heappush(g.heap, (cur[0], next(self._seq), cid))
+                    continue
+                del g.entries[cid]
+                out.append(((gid, cid), cur[1]))
+            head = self._head(g)
+            if head is None:
+                del self._guilds[gid]
+            else:
+                self._push_guild(gid, head)
+
+    async def run(self, callback: Callable[[Key, str], Awaitable[None]]):
+        while True:
+            self._wake.clear()
+            nxt = self.next_due()
+            timeout = None if nxt is None else max(0.0, nxt - self._clock())
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout)
+                continue
+            except asyncio.TimeoutError:
+                pass
+            for key, stage in self.pop_due(self._clock()):
+                await callback(key, stage)
@@ -0,0 +1,48 @@
+"""
+Transkript-Suche - Anfragen und Filter für den FTS5-Index.
+"""
+
+from typing import List, Optional, Tuple
+
+from .stats import parse_duration
+
+SEARCH_PAGE_SIZE = 10
+
+
+def fts_query(terms: List[str]) -> Optional[str]:
+    """Jeder Begriff wird als Phrase zitiert, ``begriff*`` sucht nach Präfixen."""
+    parts = []
+    for term in terms:
+        prefix = term.endswith("*")
+        term = term.rstrip("*").replace('"', '""')
+        if term:
+            parts.append(f'"{term}"' + ("*" if prefix else ""))
+    return " ".join(parts) or None
+
+
+def parse_search(text: str) -> Tuple[List[str], dict]:
+    """Trennt Suchbegriffe von Filtern (``kategorie=``, ``user=``, ``seit=``, ``seite=``), ValueError bei Fehlern."""
+    terms, opts = [], {"page": 1}
+    for tok in text.split():
+        key, sep, value = tok.partition("=")
+        key = key.lower()
+        if not sep or key not in ("kategorie", "user", "seit", "seite"):
+            terms.append(tok)
+            continue
+        if key == "kategorie":
+            opts["category"] = value
+        elif key == "user":
+            uid = value.strip("<@!>")
+            if not uid.isdigit():
+                raise ValueError(f"Ungültiger User `{value}`.")
+            opts["user_id"] = int(uid)
+        elif key == "seit":
+            secs = parse_duration(value)
+            if secs is None:
+                raise ValueError(f"Ungültige Dauer `{value}`. Beispiele: `24h`, `7d`, `4w`")
+            opts["since"] = secs
+        elif not value.isdigit() or int(value) < 1:
+            raise ValueError("`seite` erwartet eine Zahl ab 1.")
+        else:
+            opts["page"] = int(value)
+    return terms, opts
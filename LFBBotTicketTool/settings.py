@@ -0,0 +1,101 @@
+"""
+Einstellungs-Snapshot - unveränderliche, vorberechnete Sicht auf die Guild-Config.
+"""
+
+import re
+import string
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import FrozenSet, Mapping, Optional, Tuple
+
+NAME_FIELDS = frozenset({"counter", "user", "category"})
+DEFAULT_NAME_FORMAT = "ticket-{counter}"
+_NAME_SANITIZE = re.compile(r"[^a-z0-9\-]")
+
+
+def compile_name_format(fmt: str) -> str:
+    """Prüft das Namensformat einmalig, ungültige Formate fallen auf den Standard zurück."""
+    try:
+        fields = {f for _, f, _, _ in string.Formatter().parse(fmt) if f is not None}
+        if fields <= NAME_FIELDS:
+            fmt.format(counter=0, user="", category="")
+            return fmt
+    except (ValueError, IndexError, KeyError):
+        pass
+    return DEFAULT_NAME_FORMAT
+
+
+@dataclass(frozen=True)
+class GuildSettings:
+    version: int = 0
+    ticket_category: Optional[int] = None
+    archive_category: Optional[int] = None
+    support_roles: FrozenSet[int] = frozenset()
+    admin_roles: FrozenSet[int] = frozenset()
+    support_role_order: Tuple[int, ...] = ()
+    ticket_limit: int = 3
+    ticket_counter: int = 0
+    categories: Mapping[str, Mapping] = field(default_factory=lambda: MappingProxyType({}))
+    enabled_categories: Tuple[str, ...] = ()
+    default_category: Optional[str] = None
+    welcome_message: str = ""
+    log_channel: Optional[int] = None
+    log_backlog: int = 200
+    blacklist: FrozenSet[int] = frozenset()
+    feedback_enabled: bool = True
+    auto_close_hours: int = 72
+    auto_close_warning_hours: int = 24
+    claim_enabled: bool = True
+    name_format: str = DEFAULT_NAME_FORMAT
+    dm_notifications: bool = True
+    embed_color: int = 0x3498DB
+    button_style: str = "primary"
+    show_user_info: bool = True
+    ping_on_create: bool = True
+    ping_role: Optional[int] = None
+    pool_size: int = 0
+    retention_days: int = 30
+
+    @classmethod
+    def from_config(cls, data: dict, version: int = 0) -> "GuildSettings":
+        cats = {name: MappingProxyType(dict(c)) for name, c in (data.get("categories") or {}).items()}
+        return cls(
+            version=version,
+            ticket_category=data.get("ticket_category"),
+            archive_category=data.get("archive_category"),
+            support_roles=frozenset(data.get("support_roles", [])),
+            admin_roles=frozenset(data.get("admin_roles", [])),
+            support_role_order=tuple(data.get("support_roles", [])),
+            ticket_limit=data.get("ticket_limit", 3),
+            ticket_counter=data.get("ticket_counter", 0),
+            categories=MappingProxyType(cats),
+            enabled_categories=tuple(n for n, c in cats.items() if c.get("enabled", True)),
+            default_category=data.get("default_category"),
+            welcome_message=data.get("welcome_message", ""),
+            log_channel=data.get("log_channel"),
+            log_backlog=data.get("log_backlog", 200),
+            blacklist=frozenset(data.get("blacklist", [])),
+            feedback_enabled=data.get("feedback_enabled", True),
+            auto_close_hours=data.get("auto_close_hours", 72),
+            auto_close_warning_hours=data.get("auto_close_warning_hours", 24),
+            claim_enabled=data.get("claim_enabled", True),
+            name_format=compile_name_format(data.get("ticket_name_format", DEFAULT_NAME_FORMAT)),
+            dm_notifications=data.get("dm_notifications", True),
+            embed_color=data.get("embed_color", 0x3498DB),
+            button_style=data.get("button_style", "primary"),
+            show_user_info=data.get("show_user_info", True),
+            ping_on_create=data.get("ping_on_create", True),
+            ping_role=data.get("ping_role"),
+            pool_size=data.get("pool_size", 0),
+            retention_days=data.get("retention_days", 30),
+        )
+
+    def channel_name(self, counter: int, user: str, category: str) -> str:
+        name = self.name_format.format(counter=counter, user=user.lower()[:10], category=category.lower()[:10])
+        return _NAME_SANITIZE.sub("-", name)[:100]
+
+    def is_staff(self, role_ids) -> bool:
+        return any(r in self.support_roles or r in self.admin_roles for r in role_ids)
+
+    def is_support(self, role_ids) -> bool:
+        return any(r in self.support_roles for r in role_ids)
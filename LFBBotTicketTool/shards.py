@@ -0,0 +1,129 @@
+"""
+Kategorie-Shards - Überlauf-Kategorien, sobald eine Ticket-Kategorie das Discord-Limit erreicht.
+"""
+
+from typing import Dict, List, Optional, Set
+
+# Discord erlaubt höchstens 50 Channels pro Kategorie
+CATEGORY_LIMIT = 50
+# Unter so vielen freien Plätzen in der Gruppe wird vorab eine Überlauf-Kategorie angelegt
+SHARD_HEADROOM = 5
+# Eine leere Überlauf-Kategorie wird nur entfernt, wenn danach noch so viele Plätze frei sind
+SHARD_SHRINK_FREE = 25
+
+
+class CategoryShards:
+    """Belegung der Ticket-Kategorien und ihrer Überlauf-Kategorien.
+
+    Eine Gruppe besteht aus der Ausgangskategorie (``base``) und ihren
+    Überlauf-Kategorien. Belegt wird über Channel-IDs, damit Gateway-Events und
+    eigene Erstellungen nicht doppelt zählen; laufende Erstellungen halten eine
+    Reservierung, bis der Channel existiert.
+    """
+
+    def __init__(self, limit: int = CATEGORY_LIMIT, headroom: int = SHARD_HEADROOM, shrink_free: int = SHARD_SHRINK_FREE):
+        self.limit = limit
+        self.headroom = headroom
+        self.shrink_free = shrink_free
+        self._members: Dict[int, Set[int]] = {}
+        self._reserved: Dict[int, int] = {}
+        self._full: Set[int] = set()
+        self._overflow: Dict[int, Dict[int, List[int]]] = {}
+        self._base: Dict[int, int] = {}
+
+    def load(self, gid: int, overflow: Dict[int, List[int]]):
+        self._overflow[gid] = {base: list(ids) for base, ids in overflow.items() if ids}
+        for base, ids in self._overflow[gid].items():
+            for cid in ids:
+                self._base[cid] = base
+
+    def overflows(self, gid: int) -> Dict[int, List[int]]:
+        return {base: list(ids) for base, ids in self._overflow.get(gid, {}).items()}
+
+    def group(self, gid: int, base: int) -> List[int]:
+        return [base] + self._overflow.get(gid, {}).get(base, [])
+
+    def base_of(self, parent: int) -> int:
+        return self._base.get(parent, parent)
+
+    def add_overflow(self, gid: int, base: int, cid: int):
+        self._overflow.setdefault(gid, {}).setdefault(base, []).append(cid)
+        self._base[cid] = base
+        self._members[cid] = set()
+
+    def remove_overflow(self, gid: int, cid: int) -> bool:
+        base = self._base.pop(cid, None)
+        self.forget(cid)
+        if base is None:
+            return False
+        ids = self._overflow.get(gid, {}).get(base, [])
+        if cid in ids:
+            ids.remove(cid)
+        if not ids:
+            self._overflow.get(gid, {}).pop(base, None)
+        return True
+
+    def tracked(self, parent: int) -> bool:
+        return parent in self._members
+
+    def track(self, parent: int, channel_ids):
+        """Übernimmt die Belegung aus dem Channel-Cache, danach halten Events sie aktuell."""
+        self._members[parent] = set(channel_ids)
+        self._full.discard(parent)
+
+    def forget(self, parent: int):
+        self._members.pop(parent, None)
+        self._reserved.pop(parent, None)
+        self._full.discard(parent)
+
+    def place(self, parent: Optional[int], cid: int):
+        if parent in self._members:
+            self._members[parent].add(cid)
+
+    def unplace(self, parent: Optional[int], cid: int):
+        if parent in self._members:
+            self._members[parent].discard(cid)
+            self._full.discard(parent)
+
+    def mark_full(self, parent: int):
+        """Discord hat die Kategorie als voll abgelehnt, bis zum nächsten Freiwerden überspringen."""
+        self._full.add(parent)
+
+    def used(self, parent: int) -> int:
+        if parent in self._full:
+            return self.limit
+        return len(self._members.get(parent, ())) + self._reserved.get(parent, 0)
+
+    def free(self, gid: int, base: int) -> int:
+        return sum(max(self.limit - self.used(p), 0) for p in self.group(gid, base))
+
+    def pick(self, gid: int, base: int) -> Optional[int]:
+        """Reserviert einen Platz in der am wenigsten belegten Kategorie, None wenn alle voll sind."""
+        best = None
+        for p in self.group(gid, base):
+            used = self.used(p)
+            if used < self.limit and (best is None or used < self.used(best)):
+                best = p
+        if best is not None:
+            self._reserved[best] = self._reserved.get(best, 0) + 1
+        return best
+
+    def release(self, parent: int):
+        n = self._reserved.get(parent, 0) - 1
+        if n > 0:
+            self._reserved[parent] = n
+        else:
+            self._reserved.pop(parent, None)
+
+    def needs_overflow(self, gid: int, base: int) -> bool:
+        return self.free(gid, base) < self.headroom
+
+    def removable(self, gid: int, base: int) -> List[int]:
+        """Leere Überlauf-Kategorien, die entfernt werden können, jüngste zuerst."""
+        free = self.free(gid, base)
+        out = []
+        for cid in reversed(self._overflow.get(gid, {}).get(base, [])):
+            if self.tracked(cid) and self.used(cid) == 0 and free - self.limit >= self.shrink_free:
+                free -= self.limit
+                out.append(cid)
+        return out
@@ -0,0 +1,107 @@
+"""
+SLA-Metriken - Quantil-Sketches für Erstantwort- und Lösungszeiten.
+"""
+
+import math
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Relativer Fehler der Quantile (2 %)
+RELATIVE_ACCURACY = 0.02
+
+METRICS = ("first_response", "resolution")
+
+# (Metrik, Bereich, Schlüssel) - Bereich ist "all", "category" oder "staff"
+SketchKey = Tuple[str, str, str]
+
+
+class QuantileSketch:
+    """Logarithmische Buckets (DDSketch-Prinzip): feste Größe, Quantile mit relativem Fehler."""
+
+    __slots__ = ("buckets", "zero", "count", "total")
+
+    _gamma = (1 + RELATIVE_ACCURACY) / (1 - RELATIVE_ACCURACY)
+    _log_gamma = math.log(_gamma)
+
+    def __init__(self):
+        self.buckets: Dict[int, int] = {}
+        self.zero = 0
+        self.count = 0
+        self.total = 0.0
+
+    def add(self, value: float):
+        self.count += 1
+        self.total += value
+        if value < 1:
+            self.zero += 1
+            return
+        idx = math.ceil(math.log(value) / self._log_gamma)
+        self.buckets[idx] = self.buckets.get(idx, 0) + 1
+
+    def quantile(self, q: float) -> Optional[float]:
+        if not self.count:
+            return None
+        rank = q * (self.count - 1)
+        seen = self.zero
+        if rank < seen:
+            return 0.0
+        for idx in sorted(self.buckets):
+            seen += self.buckets[idx]
+            if rank < seen:
+                return 2 * self._gamma ** idx / (self._gamma + 1)
+        return 2 * self._gamma ** max(self.buckets) / (self._gamma + 1)
+
+    def to_dict(self) -> dict:
+        return {"b": {str(k): v for k, v in self.buckets.items()}, "z": self.zero, "n": self.count, "t": self.total}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "QuantileSketch":
+        sk = cls()
+        sk.buckets = {int(k): v for k, v in data.get("b", {}).items()}
+        sk.zero = data.get("z", 0)
+        sk.count = data.get("n", 0)
+        sk.total = data.get("t", 0.0)
+        return sk
+
+
+class SlaMetrics:
+    """Sketches einer Guild pro Metrik, gesamt, je Kategorie und je Team-Mitglied."""
+
+    def __init__(self):
+        self.sketches: Dict[SketchKey, QuantileSketch] = {}
+
+    def load(self, rows: Iterable[Tuple[str, str, str, dict]]):
+        for metric, scope, key, data in rows:
+            self.sketches[(metric, scope, key)] = QuantileSketch.from_dict(data)
+
+    def add(self, metric: str, seconds: float, category: Optional[str], staff_id: Optional[int]) -> List[SketchKey]:
+        """Trägt einen Messwert ein und gibt die geänderten Sketch-Schlüssel zurück."""
+        keys = [(metric, "all", "")]
+        if category:
+            keys.append((metric, "category", category))
+        if staff_id:
+            keys.append((metric, "staff", str(staff_id)))
+        for k in keys:
+            sk = self.sketches.get(k)
+            if sk is None:
+                sk = self.sketches[k] = QuantileSketch()
+            sk.add(max(seconds, 0.0))
+        return keys
+
+    def get(self, metric: str, scope: str = "all", key: str = "") -> Optional[QuantileSketch]:
+        return self.sketches.get((metric, scope, key))
+
+    def scoped(self, metric: str, scope: str) -> List[Tuple[str, QuantileSketch]]:
+        return sorted(((k, sk) for (m, s, k), sk in self.sketches.items() if m == metric and s == scope), key=lambda kv: -kv[1].count)
+
+
+def format_seconds(value: Optional[float]) -> str:
+    if value is None:
+        return "-"
+    value = int(value)
+    if value < 60:
+        return f"{value}s"
+    if value < 3600:
+        return f"{value // 60}m {value % 60}s"
+    if value < 86400:
+        return f"{value // 3600}h {value % 3600 // 60}m"
+    return f"{value // 86400}d {value % 86400 // 3600}h"
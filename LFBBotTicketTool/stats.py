@@ -0,0 +1,120 @@
+"""
+Ticket-Statistiken - laufend gepflegte Zähler und Zeit-Buckets pro Guild.
+"""
+
+import datetime
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Tuple
+
+HOUR = 3600
+DAY = 86400
+# Stündliche Buckets werden nur so lange aufbewahrt, ältere Zeiträume nutzen Tages-Buckets
+HOURLY_RETENTION = 14 * DAY
+
+# (Dimension, Schlüssel, Änderung)
+Delta = Tuple[str, str, int]
+
+
+def parse_ts(value) -> Optional[float]:
+    """Epoch-Sekunden aus Zahl oder ISO-String (naive Werte gelten als lokale Zeit)."""
+    if value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    try:
+        return datetime.datetime.fromisoformat(value).timestamp()
+    except ValueError:
+        return None
+
+
+def create_deltas(tdata: dict, ts: float) -> List[Delta]:
+    return [
+        ("status", "open", 1),
+        ("category", str(tdata.get("category")), 1),
+        ("user", str(tdata.get("user_id")), 1),
+        ("h_created", str(int(ts // HOUR)), 1),
+        ("d_created", str(int(ts // DAY)), 1),
+    ]
+
+
+def claim_deltas(claimer_id: int) -> List[Delta]:
+    return [("claimer", str(claimer_id), 1)]
+
+
+def close_deltas(ts: float) -> List[Delta]:
+    return [
+        ("status", "open", -1),
+        ("status", "closed", 1),
+        ("h_closed", str(int(ts // HOUR)), 1),
+        ("d_closed", str(int(ts // DAY)), 1),
+    ]
+
+
+class TicketStats:
+    """Zähler nach Status, Kategorie, User und Claimer plus Stunden-/Tages-Buckets."""
+
+    def __init__(self):
+        self.dims: Dict[str, Counter] = {}
+
+    def apply(self, deltas: Iterable[Delta]):
+        for dim, key, delta in deltas:
+            c = self.dims.setdefault(dim, Counter())
+            c[key] += delta
+            if not c[key]:
+                del c[key]
+
+    def get(self, dim: str, key) -> int:
+        return self.dims.get(dim, Counter()).get(str(key), 0)
+
+    def top(self, dim: str, n: int = 5) -> List[Tuple[str, int]]:
+        return self.dims.get(dim, Counter()).most_common(n)
+
+    def total(self) -> int:
+        return sum(self.dims.get("status", Counter()).values())
+
+    def window(self, since: float, until: float) -> Tuple[int, int]:
+        """Erstellte und geschlossene Tickets im Zeitraum, Kosten hängen nur von dessen Länge ab."""
+        if until - since <= 2 * DAY and since >= until - HOURLY_RETENTION:
+            unit, prefix = HOUR, "h_"
+        else:
+            unit, prefix = DAY, "d_"
+        created = self.dims.get(prefix + "created", Counter())
+        closed = self.dims.get(prefix + "closed", Counter())
+        buckets = [str(b) for b in range(int(since // unit), int(until // unit) + 1)]
+        return sum(created.get(b, 0) for b in buckets), sum(closed.get(b, 0) for b in buckets)
+
+    def expired_hours(self, now: float) -> List[Delta]:
+        """Deltas, die stündliche Buckets außerhalb der Aufbewahrung entfernen."""
+        limit = int((now - HOURLY_RETENTION) // HOUR)
+        out = []
+        for dim in ("h_created", "h_closed"):
+            for key, value in self.dims.get(dim, Counter()).items():
+                if int(key) < limit:
+                    out.append((dim, key, -value))
+        return out
+
+    def rows(self) -> List[Delta]:
+        return [(dim, key, value) for dim, c in self.dims.items() for key, value in c.items()]
+
+    @classmethod
+    def rebuild(cls, tickets: Iterable[dict], now: float) -> "TicketStats":
+        stats = cls()
+        for t in tickets:
+            created = parse_ts(t.get("created_ts", t.get("created_at"))) or now
+            stats.apply(create_deltas(t, created))
+            if t.get("claim_by"):
+                stats.apply(claim_deltas(t["claim_by"]))
+            if t.get("status") == "closed":
+                stats.apply(close_deltas(parse_ts(t.get("closed_at")) or created))
+        stats.apply(stats.expired_hours(now))
+        return stats
+
+
+_DURATION_UNITS = {"m": 60, "h": HOUR, "d": DAY, "w": 7 * DAY}
+
+
+def parse_duration(text: Optional[str]) -> Optional[int]:
+    """'30m', '24h', '7d' oder '2w' in Sekunden, None wenn ungültig."""
+    if not text or len(text) < 2 or text[-1].lower() not in _DURATION_UNITS or not text[:-1].isdigit():
+        return None
+    return int(text[:-1]) * _DURATION_UNITS[text[-1].lower()]
@@ -0,0 +1,587 @@
+"""
+Ticket-Speicher - austauschbares Backend, Standard ist SQLite.
+"""
+
+import asyncio
+import json
+import sqlite3
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Spalten, die aus dem Ticket-Dict für Indizes herausgezogen werden
+COLUMNS = ("number", "user_id", "category", "status", "claim_by")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tickets (
+    guild_id   INTEGER NOT NULL,
+    channel_id INTEGER NOT NULL,
+    number     INTEGER,
+    user_id    INTEGER,
+    category   TEXT,
+    status     TEXT NOT NULL DEFAULT 'open',
+    claim_by   INTEGER,
+    data       TEXT NOT NULL,
+    PRIMARY KEY (guild_id, channel_id)
+);
+CREATE INDEX IF NOT EXISTS idx_tickets_status ON tickets (guild_id, status);
+CREATE INDEX IF NOT EXISTS idx_tickets_user ON tickets (guild_id, user_id);
+CREATE INDEX IF NOT EXISTS idx_tickets_category ON tickets (guild_id, category);
+CREATE TABLE IF NOT EXISTS migrations (
+    guild_id INTEGER PRIMARY KEY
+);
+CREATE TABLE IF NOT EXISTS counters (
+    guild_id   INTEGER PRIMARY KEY,
+    high_water INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS stats (
+    guild_id INTEGER NOT NULL,
+    dim      TEXT NOT NULL,
+    key      TEXT NOT NULL,
+    value    INTEGER NOT NULL,
+    PRIMARY KEY (guild_id, dim, key)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS sketches (
+    guild_id INTEGER NOT NULL,
+    metric   TEXT NOT NULL,
+    scope    TEXT NOT NULL,
+    key      TEXT NOT NULL,
+    data     TEXT NOT NULL,
+    PRIMARY KEY (guild_id, metric, scope, key)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS feedback (
+    guild_id   INTEGER NOT NULL,
+    channel_id INTEGER NOT NULL,
+    number     INTEGER,
+    user_id    INTEGER NOT NULL,
+    category   TEXT,
+    claim_by   INTEGER,
+    rating     INTEGER NOT NULL,
+    comment    TEXT,
+    ts         REAL NOT NULL,
+    PRIMARY KEY (guild_id, channel_id)
+);
+CREATE TABLE IF NOT EXISTS feedback_stats (
+    guild_id INTEGER NOT NULL,
+    dim      TEXT NOT NULL,
+    key      TEXT NOT NULL,
+    rating   INTEGER NOT NULL,
+    count    INTEGER NOT NULL,
+    PRIMARY KEY (guild_id, dim, key, rating)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS jobs (
+    id       INTEGER PRIMARY KEY AUTOINCREMENT,
+    guild_id INTEGER NOT NULL,
+    kind     TEXT NOT NULL,
+    target   INTEGER,
+    due      REAL NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    payload  TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS archive_index (
+    guild_id   INTEGER NOT NULL,
+    channel_id INTEGER NOT NULL,
+    number     INTEGER,
+    user_id    INTEGER,
+    segment    TEXT NOT NULL,
+    PRIMARY KEY (guild_id, channel_id)
+);
+CREATE INDEX IF NOT EXISTS idx_archive_number ON archive_index (guild_id, number);
+CREATE INDEX IF NOT EXISTS idx_archive_user ON archive_index (guild_id, user_id);
+CREATE TABLE IF NOT EXISTS bulk_runs (
+    guild_id INTEGER PRIMARY KEY,
+    data     TEXT NOT NULL
+);
+"""
+
+# Volltextindex der Transkripte, eine Zeile pro Ticket: mehrere Suchbegriffe dürfen in
+# verschiedenen Nachrichten stehen und jedes Ticket erscheint nur einmal. gkey/ckey ("g<id>", "c<id>") sind
+# mitindiziert, damit Guild-Filter und Löschen pro Ticket über den Index statt per Scan laufen.
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS transcript_fts USING fts5(
+    body, gkey, ckey,
+    channel_id UNINDEXED, number UNINDEXED, category UNINDEXED, user_id UNINDEXED, closed_at UNINDEXED,
+    tokenize = "unicode61 remove_diacritics 2"
+);
+"""
+
+
+class TicketStore(ABC):
+    """Schnittstelle für Ticket-Speicher."""
+
+    # True, wenn ``index_transcript``/``search_transcripts`` eine Volltextsuche bereitstellen
+    fts: bool = False
+
+    @abstractmethod
+    async def open(self):
+        ...
+
+    @abstractmethod
+    async def close(self):
+        ...
+
+    @abstractmethod
+    async def load_all(self) -> Dict[int, Dict[int, dict]]:
+        ...
+
+    @abstractmethod
+    async def get(self, guild_id: int, channel_id: int) -> Optional[dict]:
+        ...
+
+    @abstractmethod
+    async def upsert(self, guild_id: int, tdata: dict):
+        ...
+
+    @abstractmethod
+    async def update(self, guild_id: int, channel_id: int, **changes) -> Optional[dict]:
+        ...
+
+    @abstractmethod
+    async def update_many(self, guild_id: int, updates: Dict[int, dict]):
+        ...
+
+    @abstractmethod
+    async def reserve_numbers(self, guild_id: int, n: int, floor: int = 0) -> Tuple[int, int]:
+        ...
+
+    @abstractmethod
+    async def all_tickets(self, guild_id: int) -> List[dict]:
+        ...
+
+    @abstractmethod
+    async def load_stats(self) -> Dict[int, List[tuple]]:
+        ...
+
+    @abstractmethod
+    async def bump_stats(self, guild_id: int, deltas: Iterable[tuple]):
+        ...
+
+    @abstractmethod
+    async def replace_stats(self, guild_id: int, rows: Iterable[tuple]):
+        ...
+
+    @abstractmethod
+    async def load_sketches(self) -> Dict[int, List[tuple]]:
+        ...
+
+    @abstractmethod
+    async def save_sketches(self, guild_id: int, rows: Iterable[tuple]):
+        ...
+
+    @abstractmethod
+    async def add_feedback(self, guild_id: int, record: dict, deltas: Iterable[tuple]) -> bool:
+        ...
+
+    @abstractmethod
+    async def load_feedback_stats(self) -> Dict[int, List[tuple]]:
+        ...
+
+    @abstractmethod
+    async def load_jobs(self) -> List[dict]:
+        ...
+
+    @abstractmethod
+    async def add_job(self, job: dict) -> int:
+        ...
+
+    @abstractmethod
+    async def reschedule_job(self, job_id: int, due: float, attempts: int):
+        ...
+
+    @abstractmethod
+    async def delete_job(self, job_id: int):
+        ...
+
+    @abstractmethod
+    async def archive_tickets(self, guild_id: int, rows: Iterable[tuple]):
+        ...
+
+    @abstractmethod
+    async def archive_lookup(self, guild_id: int, number: Optional[int] = None, user_id: Optional[int] = None) -> Dict[str, set]:
+        ...
+
+    @abstractmethod
+    async def index_transcript(self, guild_id: int, tdata: dict, path: Path, skip: int = 0):
+        ...
+
+    @abstractmethod
+    async def search_transcripts(self, guild_id: int, match: str, limit: int, offset: int = 0, **filters) -> Tuple[List[dict], bool]:
+        ...
+
+    @abstractmethod
+    async def load_bulk_runs(self) -> Dict[int, dict]:
+        ...
+
+    @abstractmethod
+    async def save_bulk_run(self, guild_id: int, run: Optional[dict]):
+        ...
+
+    @abstractmethod
+    async def delete_guild(self, guild_id: int):
+        ...
+
+    @abstractmethod
+    async def is_migrated(self, guild_id: int) -> bool:
+        ...
+
+    @abstractmethod
+    async def import_tickets(self, guild_id: int, tickets: Iterable[dict]):
+        ...
+
+
+class SQLiteTicketStore(TicketStore):
+    """SQLite-Datei im Cog-Datenordner (WAL), alle Zugriffe in einem eigenen Thread."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._db: Optional[sqlite3.Connection] = None
+        self.fts = False
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="lfb-store")
+
+    async def _run(self, fn, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+
+    # --- Verbindung ---
+    async def open(self):
+        await self._run(self._open)
+
+    def _open(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        db = sqlite3.connect(str(self.path), check_same_thread=False)
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute("PRAGMA synchronous=NORMAL")
+        db.executescript(SCHEMA)
+        try:
+            db.executescript(FTS_SCHEMA)
+            self.fts = True
+        except sqlite3.OperationalError:
+            self.fts = False
+        self._db = db
+
+    async def close(self):
+        if self._db is not None:
+            await self._run(self._db.close)
+            self._db = None
+        self._executor.shutdown(wait=False)
+
+    # --- Hilfen ---
+    @staticmethod
+    def _row(tdata: dict) -> tuple:
+        return tuple(tdata.get(c) for c in COLUMNS) + (json.dumps(tdata),)
+
+    def _upsert(self, guild_id: int, tdata: dict):
+        self._db.execute(
+            "INSERT OR REPLACE INTO tickets (guild_id, channel_id, number, user_id, category, status, claim_by, data) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (guild_id, tdata["channel_id"]) + self._row(tdata),
+        )
+
+    def _query(self, sql: str, args: tuple) -> List[dict]:
+        return [json.loads(r[0]) for r in self._db.execute(sql, args)]
+
+    # --- Lesen ---
+    async def load_all(self) -> Dict[int, Dict[int, dict]]:
+        def fn():
+            out: Dict[int, Dict[int, dict]] = {}
+            for gid, cid, data in self._db.execute("SELECT guild_id, channel_id, data FROM tickets"):
+                out.setdefault(gid, {})[cid] = json.loads(data)
+            return out
+
+        return await self._run(fn)
+
+    async def get(self, guild_id: int, channel_id: int) -> Optional[dict]:
+        rows = await self._run(self._query, "SELECT data FROM tickets WHERE guild_id = ? AND channel_id = ?", (guild_id, channel_id))
+        return rows[0] if rows else None
+
+    async def all_tickets(self, guild_id: int) -> List[dict]:
+        return await self._run(self._query, "SELECT data FROM tickets WHERE guild_id = ?", (guild_id,))
+
+    # --- Schreiben ---
+    async def upsert(self, guild_id: int, tdata: dict):
+        tdata = dict(tdata)
+
+        def fn():
+            with self._db:
+                self._upsert(guild_id, tdata)
+
+        await self._run(fn)
+
+    async def update(self, guild_id: int, channel_id: int, **changes) -> Optional[dict]:
+        def fn():
+            with self._db:
+                row = self._db.execute("SELECT data FROM tickets WHERE guild_id = ? AND channel_id = ?", (guild_id, channel_id)).fetchone()
+                if row is None:
+                    return None
+                tdata = json.loads(row[0])
+                tdata.update(changes)
+                self._upsert(guild_id, tdata)
+                return tdata
+
+        return await self._run(fn)
+
+    async def update_many(self, guild_id: int, updates: Dict[int, dict]):
+        updates = {cid: dict(ch) for cid, ch in updates.items()}
+
+        def fn():
+            with self._db:
+                for cid, changes in updates.items():
+                    row = self._db.execute("SELECT data FROM tickets WHERE guild_id = ? AND channel_id = ?", (guild_id, cid)).fetchone()
+                    if row is not None:
+                        tdata = json.loads(row[0])
+                        tdata.update(changes)
+                        self._upsert(guild_id, tdata)
+
+        await self._run(fn)
+
+    # --- Statistiken ---
+    async def load_stats(self) -> Dict[int, List[tuple]]:
+        def fn():
+            out: Dict[int, List[tuple]] = {}
+            for gid, dim, key, value in self._db.execute("SELECT guild_id, dim, key, value FROM stats"):
+                out.setdefault(gid, []).append((dim, key, value))
+            return out
+
+        return await self._run(fn)
+
+    async def bump_stats(self, guild_id: int, deltas: Iterable[tuple]):
+        deltas = list(deltas)
+
+        def fn():
+            with self._db:
+                self._db.executemany(
+                    "INSERT INTO stats (guild_id, dim, key, value) VALUES (?, ?, ?, ?) ON CONFLICT (guild_id, dim, key) DO UPDATE SET value = value + excluded.value",
+                    [(guild_id, dim, key, delta) for dim, key, delta in deltas],
+                )
+                self._db.execute("DELETE FROM stats WHERE guild_id = ? AND value = 0", (guild_id,))
+
+        await self._run(fn)
+
+    async def replace_stats(self, guild_id: int, rows: Iterable[tuple]):
+        rows = list(rows)
+
+        def fn():
+            with self._db:
+                self._db.execute("DELETE FROM stats WHERE guild_id = ?", (guild_id,))
+                self._db.executemany("INSERT INTO stats (guild_id, dim, key, value) VALUES (?, ?, ?, ?)", [(guild_id,) + tuple(r) for r in rows])
+
+        await self._run(fn)
+
+    # --- SLA-Sketches ---
+    async def load_sketches(self) -> Dict[int, List[tuple]]:
+        def fn():
+            out: Dict[int, List[tuple]] = {}
+            for gid, metric, scope, key, data in self._db.execute("SELECT guild_id, metric, scope, key, data FROM sketches"):
+                out.setdefault(gid, []).append((metric, scope, key, json.loads(data)))
+            return out
+
+        return await self._run(fn)
+
+    async def save_sketches(self, guild_id: int, rows: Iterable[tuple]):
+        rows = [(guild_id, metric, scope, key, json.dumps(data, separators=(",", ":"))) for metric, scope, key, data in rows]
+
+        def fn():
+            with self._db:
+                self._db.executemany("INSERT OR REPLACE INTO sketches (guild_id, metric, scope, key, data) VALUES (?, ?, ?, ?, ?)", rows)
+
+        await self._run(fn)
+
+    # --- Feedback ---
+    async def add_feedback(self, guild_id: int, record: dict, deltas: Iterable[tuple]) -> bool:
+        """Speichert eine Bewertung samt Aggregat-Änderungen, False wenn das Ticket schon bewertet ist."""
+        deltas = list(deltas)
+
+        def fn():
+            with self._db:
+                cur = self._db.execute(
+                    "INSERT OR IGNORE INTO feedback (guild_id, channel_id, number, user_id, category, claim_by, rating, comment, ts) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (guild_id, record["channel_id"], record.get("number"), record["user_id"], record.get("category"), record.get("claim_by"), record["rating"], record.get("comment"), record["ts"]),
+                )
+                if not cur.rowcount:
+                    return False
+                self._db.executemany(
+                    "INSERT INTO feedback_stats (guild_id, dim, key, rating, count) VALUES (?, ?, ?, ?, ?) ON CONFLICT (guild_id, dim, key, rating) DO UPDATE SET count = count + excluded.count",
+                    [(guild_id,) + tuple(d) for d in deltas],
+                )
+                return True
+
+        return await self._run(fn)
+
+    async def load_feedback_stats(self) -> Dict[int, List[tuple]]:
+        def fn():
+            out: Dict[int, List[tuple]] = {}
+            for gid, dim, key, rating, count in self._db.execute("SELECT guild_id, dim, key, rating, count FROM feedback_stats"):
+                out.setdefault(gid, []).append((dim, key, rating, count))
+            return out
+
+        return await self._run(fn)
+
+    # --- Aufträge ---
+    async def load_jobs(self) -> List[dict]:
+        def fn():
+            return [
+                {"id": jid, "guild_id": gid, "kind": kind, "target": target, "due": due, "attempts": attempts, "payload": json.loads(payload)}
+                for jid, gid, kind, target, due, attempts, payload in self._db.execute("SELECT id, guild_id, kind, target, due, attempts, payload FROM jobs")
+            ]
+
+        return await self._run(fn)
+
+    async def add_job(self, job: dict) -> int:
+        row = (job["guild_id"], job["kind"], job.get("target"), job["due"], job.get("attempts", 0), json.dumps(job.get("payload") or {}))
+
+        def fn():
+            with self._db:
+                return self._db.execute("INSERT INTO jobs (guild_id, kind, target, due, attempts, payload) VALUES (?, ?, ?, ?, ?, ?)", row).lastrowid
+
+        return await self._run(fn)
+
+    async def reschedule_job(self, job_id: int, due: float, attempts: int):
+        def fn():
+            with self._db:
+                self._db.execute("UPDATE jobs SET due = ?, attempts = ? WHERE id = ?", (due, attempts, job_id))
+
+        await self._run(fn)
+
+    async def delete_job(self, job_id: int):
+        def fn():
+            with self._db:
+                self._db.execute("DELETE FROM jobs WHERE id = ?", (job_id,))
+
+        await self._run(fn)
+
+    # --- Archiv ---
+    async def archive_tickets(self, guild_id: int, rows: Iterable[tuple]):
+        """Verweist (channel_id, number, user_id, segment) ins Archiv und entfernt die Tickets aus dem Speicher."""
+        rows = [(guild_id,) + tuple(r) for r in rows]
+
+        def fn():
+            with self._db:
+                self._db.executemany("INSERT OR REPLACE INTO archive_index (guild_id, channel_id, number, user_id, segment) VALUES (?, ?, ?, ?, ?)", rows)
+                self._db.executemany("DELETE FROM tickets WHERE guild_id = ? AND channel_id = ?", [(r[0], r[1]) for r in rows])
+
+        await self._run(fn)
+
+    async def archive_lookup(self, guild_id: int, number: Optional[int] = None, user_id: Optional[int] = None) -> Dict[str, set]:
+        """Segment -> Channel-IDs der archivierten Tickets mit dieser Nummer bzw. von diesem User."""
+
+        def fn():
+            if number is not None:
+                cur = self._db.execute("SELECT segment, channel_id FROM archive_index WHERE guild_id = ? AND number = ?", (guild_id, number))
+            else:
+                cur = self._db.execute("SELECT segment, channel_id FROM archive_index WHERE guild_id = ? AND user_id = ?", (guild_id, user_id))
+            out: Dict[str, set] = {}
+            for segment, cid in cur:
+                out.setdefault(segment, set()).add(cid)
+            return out
+
+        return await self._run(fn)
+
+    # --- Volltextsuche ---
+    async def index_transcript(self, guild_id: int, tdata: dict, path: Path, skip: int = 0):
+        """Indiziert das Transkript (ohne die ersten ``skip`` Kopfzeilen) als ein Dokument, ein bestehender Eintrag wird ersetzt."""
+        if not self.fts:
+            return
+        cid = tdata["channel_id"]
+        meta = (f"g{guild_id}", f"c{cid}", cid, tdata.get("number"), tdata.get("category"), tdata.get("user_id"), tdata.get("closed_at"))
+
+        def fn():
+            with open(path, "r", encoding="utf-8", errors="replace") as f, self._db:
+                self._db.execute("DELETE FROM transcript_fts WHERE transcript_fts MATCH ?", (f"ckey:c{cid}",))
+                body = "".join(line for i, line in enumerate(f) if i >= skip and line.strip())
+                if body:
+                    self._db.execute(
+                        "INSERT INTO transcript_fts (body, gkey, ckey, channel_id, number, category, user_id, closed_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                        (body,) + meta,
+                    )
+
+        await self._run(fn)
+
+    async def search_transcripts(self, guild_id: int, match: str, limit: int, offset: int = 0, **filters) -> Tuple[List[dict], bool]:
+        """Tickets nach Relevanz mit einem Ausschnitt, optional gefiltert nach ``category``, ``user_id`` und ``since`` (Epoch)."""
+        sql = "SELECT channel_id, number, category, user_id, closed_at, snippet(transcript_fts, 0, '**', '**', '…', 16) FROM transcript_fts WHERE transcript_fts MATCH ?"
+        args: list = [f"gkey:g{guild_id} AND body:({match})"]
+        if filters.get("category"):
+            sql += " AND category = ?"
+            args.append(filters["category"])
+        if filters.get("user_id"):
+            sql += " AND user_id = ?"
+            args.append(filters["user_id"])
+        if filters.get("since"):
+            sql += " AND closed_at >= ?"
+            args.append(filters["since"])
+        sql += " ORDER BY rank LIMIT ? OFFSET ?"
+        args += [limit + 1, offset]
+
+        def fn():
+            rows = self._db.execute(sql, args).fetchall()
+            keys = ("channel_id", "number", "category", "user_id", "closed_at", "snippet")
+            return [dict(zip(keys, r)) for r in rows[:limit]], len(rows) > limit
+
+        return await self._run(fn)
+
+    # --- Massenaktionen ---
+    async def load_bulk_runs(self) -> Dict[int, dict]:
+        return await self._run(lambda: {gid: json.loads(data) for gid, data in self._db.execute("SELECT guild_id, data FROM bulk_runs")})
+
+    async def save_bulk_run(self, guild_id: int, run: Optional[dict]):
+        """Speichert den Zustand eines Laufs, None entfernt ihn."""
+        data = json.dumps(run) if run is not None else None
+
+        def fn():
+            with self._db:
+                if data is None:
+                    self._db.execute("DELETE FROM bulk_runs WHERE guild_id = ?", (guild_id,))
+                else:
+                    self._db.execute("INSERT OR REPLACE INTO bulk_runs (guild_id, data) VALUES (?, ?)", (guild_id, data))
+
+        await self._run(fn)
+
+    async def reserve_numbers(self, guild_id: int, n: int, floor: int = 0) -> Tuple[int, int]:
+        """Reserviert ``n`` Ticket-Nummern dauerhaft, gibt (erste, letzte) zurück."""
+
+        def fn():
+            with self._db:
+                row = self._db.execute("SELECT high_water FROM counters WHERE guild_id = ?", (guild_id,)).fetchone()
+                if row is None:
+                    top = self._db.execute("SELECT MAX(number) FROM tickets WHERE guild_id = ?", (guild_id,)).fetchone()[0]
+                    hw = max(floor, top or 0)
+                else:
+                    hw = max(floor, row[0])
+                self._db.execute("INSERT OR REPLACE INTO counters (guild_id, high_water) VALUES (?, ?)", (guild_id, hw + n))
+                return hw + 1, hw + n
+
+        return await self._run(fn)
+
+    async def delete_guild(self, guild_id: int):
+        def fn():
+            with self._db:
+                self._db.execute("DELETE FROM tickets WHERE guild_id = ?", (guild_id,))
+                self._db.execute("DELETE FROM counters WHERE guild_id = ?", (guild_id,))
+                self._db.execute("DELETE FROM stats WHERE guild_id = ?", (guild_id,))
+                self._db.execute("DELETE FROM sketches WHERE guild_id = ?", (guild_id,))
+                self._db.execute("DELETE FROM feedback WHERE guild_id = ?", (guild_id,))
+                self._db.execute("DELETE FROM feedback_stats WHERE guild_id = ?", (guild_id,))
+                self._db.execute("DELETE FROM archive_index WHERE guild_id = ?", (guild_id,))
+                self._db.execute("DELETE FROM jobs WHERE guild_id = ?", (guild_id,))
+                self._db.execute("DELETE FROM bulk_runs WHERE guild_id = ?", (guild_id,))
+                if self.fts:
+                    self._db.execute("DELETE FROM transcript_fts WHERE transcript_fts MATCH ?", (f"gkey:g{guild_id}",))
+
+        await self._run(fn)
+
+    # --- Migration ---
+    async def is_migrated(self, guild_id: int) -> bool:
+        return await self._run(lambda: self._db.execute("SELECT 1 FROM migrations WHERE guild_id = ?", (guild_id,)).fetchone() is not None)
+
+    async def import_tickets(self, guild_id: int, tickets: Iterable[dict]):
+        tickets = [dict(t) for t in tickets]
+
+        def fn():
+            with self._db:
+                for tdata in tickets:
+                    self._db.execute(
+                        "INSERT OR IGNORE INTO tickets (guild_id, channel_id, number, user_id, category, status, claim_by, data) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                        (guild_id, tdata["channel_id"]) + self._row(tdata),
+                    )
+                self._db.execute("INSERT OR IGNORE INTO migrations (guild_id) VALUES (?)", (guild_id,))
+
+        await self._run(fn)
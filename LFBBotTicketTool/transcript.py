@@ -0,0 +1,272 @@
+"""
+Transkripte - Nachrichten werden seitenweise in eine temporäre Datei gestreamt.
+"""
+
+import asyncio
+import datetime
+import gzip
+import html
+import json
+import os
+import string
+import tempfile
+import weakref
+from pathlib import Path
+from typing import IO, Callable, Dict, Iterable, List, Optional, Tuple
+
+# Ab dieser Größe wird das Transkript auf die Platte ausgelagert
+SPOOL_MAX_BYTES = 4 * 1024 * 1024
+COPY_CHUNK_BYTES = 64 * 1024
+
+
+def header_lines(channel_name: str, guild_name: str) -> Iterable[str]:
+    return [f"Transkript - {channel_name}", f"Server: {guild_name}", f"Zeit: {datetime.datetime.now().strftime('%d.%m.%Y %H:%M')}", "=" * 40, ""]
+
+
+def message_fields(m) -> Tuple[datetime.datetime, str, str]:
+    """Rohdaten einer Nachricht, im Event-Loop abgegriffen und später im Worker formatiert."""
+    return m.created_at, str(m.author), m.content
+
+
+def format_fields(created_at: datetime.datetime, author: str, content: str) -> str:
+    return f"[{created_at.strftime('%d.%m.%Y %H:%M')}] {author}: {content or '[Medien]'}"
+
+
+def message_record(m) -> dict:
+    """Kompakte Darstellung einer Nachricht für JSON-Lines und HTML, leere Felder fehlen."""
+    rec = {"id": m.id, "ts": round(m.created_at.timestamp(), 3), "a": m.author.id, "an": str(m.author)}
+    if m.content:
+        rec["c"] = m.content
+    if m.edited_at:
+        rec["e"] = round(m.edited_at.timestamp(), 3)
+    if m.reference and m.reference.message_id:
+        rec["r"] = m.reference.message_id
+    if m.attachments:
+        rec["att"] = [{"n": a.filename, "s": a.size, "u": a.url, "t": a.content_type} for a in m.attachments]
+    if m.embeds:
+        embs = []
+        for e in m.embeds:
+            emb = {k: v for k, v in (("t", e.title), ("d", e.description), ("u", e.url)) if v}
+            if e.fields:
+                emb["f"] = [[f.name, f.value] for f in e.fields]
+            embs.append(emb)
+        rec["emb"] = embs
+    return rec
+
+
+class TranscriptWriter:
+    """Schreibt Zeilen in eine SpooledTemporaryFile, optional gzip-komprimiert."""
+
+    def __init__(self, filename: str, compress: bool = False):
+        self.filename = filename + (".gz" if compress else "")
+        self.count = 0
+        self._file = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_BYTES)
+        self._out: IO[bytes] = gzip.GzipFile(fileobj=self._file, mode="wb") if compress else self._file
+
+    def write(self, line: str):
+        self._out.write(line.encode("utf-8") + b"\n")
+
+    def write_bytes(self, data: bytes):
+        self._out.write(data)
+
+    def finish(self) -> IO[bytes]:
+        """Schließt den Kompressor und gibt die Datei zurückgespult zurück."""
+        if self._out is not self._file:
+            self._out.close()
+        self._file.seek(0)
+        return self._file
+
+    def close(self):
+        if self._out is not self._file and not self._out.closed:
+            self._out.close()
+        self._file.close()
+
+
+class TranscriptCache:
+    """Gerenderte Zeilen pro Ticket auf der Platte plus ID der letzten enthaltenen Nachricht.
+
+    ``size`` in den Metadaten markiert das Ende der gültigen Daten, ein
+    abgebrochenes Anhängen wird beim nächsten Mal abgeschnitten. Aktualisieren,
+    Kopieren, Verwerfen und Abschließen laufen nur unter ``lock`` des Tickets.
+    """
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+        self._meta: Dict[Tuple[int, int], Optional[dict]] = {}
+        self._gen: Dict[Tuple[int, int], int] = {}
+        self._locks: "weakref.WeakValueDictionary[Tuple[int, int], asyncio.Lock]" = weakref.WeakValueDictionary()
+
+    def lock(self, gid: int, cid: int) -> asyncio.Lock:
+        """Lock pro Ticket, lebt so lange, wie jemand ihn hält oder darauf wartet."""
+        lock = self._locks.get((gid, cid))
+        if lock is None:
+            lock = self._locks[(gid, cid)] = asyncio.Lock()
+        return lock
+
+    def _paths(self, gid: int, cid: int) -> Tuple[Path, Path]:
+        d = self.root / "cache" / str(gid)
+        return d / f"{cid}.txt", d / f"{cid}.json"
+
+    def meta(self, gid: int, cid: int) -> Optional[dict]:
+        key = (gid, cid)
+        if key not in self._meta:
+            try:
+                self._meta[key] = json.loads(self._paths(gid, cid)[1].read_text())
+            except (OSError, ValueError):
+                self._meta[key] = None
+        return self._meta[key]
+
+    def last_id(self, gid: int, cid: int) -> int:
+        meta = self.meta(gid, cid)
+        return meta["last_id"] if meta else 0
+
+    def count(self, gid: int, cid: int) -> int:
+        meta = self.meta(gid, cid)
+        return meta["count"] if meta else 0
+
+    def generation(self, gid: int, cid: int) -> int:
+        return self._gen.get((gid, cid), 0)
+
+    def append(self, gid: int, cid: int, lines: List[str], last_id: int, gen: int) -> bool:
+        """Hängt Zeilen an; False wenn der Cache seit ``gen`` verworfen wurde."""
+        if self.generation(gid, cid) != gen:
+            return False
+        txt, js = self._paths(gid, cid)
+        txt.parent.mkdir(parents=True, exist_ok=True)
+        meta = self.meta(gid, cid) or {"last_id": 0, "count": 0, "size": 0}
+        data = "".join(line + "\n" for line in lines).encode("utf-8")
+        with open(txt, "r+b" if txt.exists() else "wb") as f:
+            f.truncate(meta["size"])
+            f.seek(meta["size"])
+            f.write(data)
+        new = {"last_id": last_id, "count": meta["count"] + len(lines), "size": meta["size"] + len(data)}
+        tmp = js.with_suffix(".tmp")
+        tmp.write_text(json.dumps(new))
+        os.replace(tmp, js)
+        self._meta[(gid, cid)] = new
+        return True
+
+    def copy_to(self, gid: int, cid: int, write: Callable[[bytes], object]):
+        meta = self.meta(gid, cid)
+        if not meta:
+            return
+        left = meta["size"]
+        with open(self._paths(gid, cid)[0], "rb") as f:
+            while left > 0:
+                chunk = f.read(min(COPY_CHUNK_BYTES, left))
+                if not chunk:
+                    break
+                write(chunk)
+                left -= len(chunk)
+
+    def invalidate(self, gid: int, cid: int):
+        key = (gid, cid)
+        self._gen[key] = self._gen.get(key, 0) + 1
+        self._meta[key] = None
+        for p in self._paths(gid, cid):
+            try:
+                p.unlink()
+            except FileNotFoundError:
+                pass
+
+    def final_path(self, gid: int, cid: int) -> Path:
+        return self.root / "final" / str(gid) / f"{cid}.txt"
+
+    def finalize(self, gid: int, cid: int, header: Iterable[str]) -> Path:
+        """Schreibt das endgültige Transkript (Kopfzeilen + Cache) und verwirft den Cache."""
+        dest = self.final_path(gid, cid)
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        with open(dest, "wb") as f:
+            for line in header:
+                f.write(line.encode("utf-8") + b"\n")
+            self.copy_to(gid, cid, f.write)
+        # Die Generation bleibt erhalten, damit ein noch laufendes Anhängen verworfen wird
+        self.invalidate(gid, cid)
+        self._meta.pop((gid, cid), None)
+        return dest
+
+
+HTML_HEAD = string.Template(
+    """<!DOCTYPE html>
+<html lang="de"><head><meta charset="utf-8"><title>Transkript - $channel</title>
+<style>
+body{font-family:sans-serif;background:#313338;color:#dbdee1;margin:0;padding:1em}
+h1{font-size:1.3em}.meta{color:#949ba4;font-size:.85em}
+.msg{padding:.4em .6em;border-bottom:1px solid #3f4147}.author{font-weight:bold;color:#f2f3f5}
+.ts{color:#949ba4;font-size:.75em;margin-left:.5em}.content{white-space:pre-wrap;word-wrap:break-word}
+.reply{color:#949ba4;font-size:.8em}.reply a{color:#00a8fc}
+.embed{border-left:4px solid #5865f2;background:#2b2d31;padding:.4em .6em;margin:.3em 0;max-width:520px}
+.embed .t{font-weight:bold}.embed .f{margin-top:.3em}.embed .fn{font-weight:bold;font-size:.85em}
+.att a{color:#00a8fc}.att{font-size:.85em}
+</style></head><body>
+<h1>Transkript - $channel</h1><p class="meta">Server: $guild &middot; Erstellt: $time</p>
+<div class="log">
+"""
+)
+HTML_MESSAGE = string.Template(
+    '<div class="msg" id="m$id">$reply<div><span class="author">$author</span><span class="ts">$time$edited</span></div>'
+    '<div class="content">$content</div>$embeds$attachments</div>\n'
+)
+HTML_EMBED = string.Template('<div class="embed">$title$description$fields</div>')
+HTML_FOOT = string.Template('</div><p class="meta">$count Nachrichten</p></body></html>\n')
+
+
+def _ts(ts: float) -> str:
+    return datetime.datetime.fromtimestamp(ts, datetime.timezone.utc).strftime("%d.%m.%Y %H:%M UTC")
+
+
+def render_html_message(rec: dict) -> str:
+    esc = html.escape
+    embeds = []
+    for emb in rec.get("emb", ()):
+        title = emb.get("t")
+        if title and emb.get("u"):
+            title = f'<a href="{esc(emb["u"])}">{esc(title)}</a>'
+        elif title:
+            title = esc(title)
+        embeds.append(
+            HTML_EMBED.substitute(
+                title=f'<div class="t">{title}</div>' if title else "",
+                description=f'<div class="content">{esc(emb["d"])}</div>' if emb.get("d") else "",
+                fields="".join(f'<div class="f"><div class="fn">{esc(n)}</div><div class="content">{esc(v)}</div></div>' for n, v in emb.get("f", ())),
+            )
+        )
+    atts = "".join(f'<div class="att">📎 <a href="{esc(a["u"])}">{esc(a["n"])}</a> ({a["s"] / 1024:.1f} KB)</div>' for a in rec.get("att", ()))
+    return HTML_MESSAGE.substitute(
+        id=rec["id"],
+        reply=f'<div class="reply">↪ Antwort auf <a href="#m{rec["r"]}">Nachricht</a></div>' if "r" in rec else "",
+        author=esc(rec["an"]),
+        time=_ts(rec["ts"]),
+        edited=f" (bearbeitet {_ts(rec['e'])})" if "e" in rec else "",
+        content=esc(rec.get("c", "")),
+        embeds="".join(embeds),
+        attachments=atts,
+    )
+
+
+class HtmlTranscript:
+    """Eigenständige HTML-Datei plus JSON-Lines-Begleitdatei in einem Durchlauf."""
+
+    def __init__(self, basename: str, channel_name: str, guild_name: str, compress: bool = False):
+        self.html = TranscriptWriter(f"{basename}.html", compress)
+        self.jsonl = TranscriptWriter(f"{basename}.jsonl", compress)
+        self.count = 0
+        self.html.write_bytes(HTML_HEAD.substitute(channel=html.escape(channel_name), guild=html.escape(guild_name), time=datetime.datetime.now().strftime("%d.%m.%Y %H:%M")).encode("utf-8"))
+
+    def add(self, rec: dict):
+        self.html.write_bytes(render_html_message(rec).encode("utf-8"))
+        self.jsonl.write(json.dumps(rec, ensure_ascii=False, separators=(",", ":")))
+        self.count += 1
+
+    def add_many(self, recs: Iterable[dict]):
+        for rec in recs:
+            self.add(rec)
+
+    def finish(self) -> List[TranscriptWriter]:
+        self.html.write_bytes(HTML_FOOT.substitute(count=self.count).encode("utf-8"))
+        self.html.count = self.jsonl.count = self.count
+        return [self.html, self.jsonl]
+
+    def close(self):
+        self.html.close()
+        self.jsonl.close()
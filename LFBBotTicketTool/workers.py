@@ -0,0 +1,63 @@
+"""
+Worker-Pool und Event-Loop-Überwachung - rechenintensive Schritte laufen außerhalb des Event-Loops.
+"""
+
+import asyncio
+import functools
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional
+
+log = logging.getLogger("red.lfbbottickettool")
+
+RENDER_WORKERS = 2
+# Prüfintervall und Schwelle, ab der eine Verzögerung des Event-Loops geloggt wird (Sekunden)
+LAG_INTERVAL = 0.5
+LAG_THRESHOLD = 0.25
+
+
+class RenderPool:
+    """Begrenzter Thread-Pool für Formatieren, Kodieren, Komprimieren und Dateizugriffe.
+
+    Abgerufen wird weiterhin im Event-Loop, hier landen nur fertige Daten.
+    """
+
+    def __init__(self, workers: int = RENDER_WORKERS):
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="lfb-render")
+
+    async def run(self, fn: Callable, *args, **kwargs):
+        return await asyncio.get_running_loop().run_in_executor(self._executor, functools.partial(fn, *args, **kwargs))
+
+    def close(self):
+        self._executor.shutdown(wait=False)
+
+
+class LoopLagMonitor:
+    """Misst, wie viel später als geplant ein kurzer Sleep zurückkehrt, und loggt Ausreißer."""
+
+    def __init__(self, interval: float = LAG_INTERVAL, threshold: float = LAG_THRESHOLD):
+        self.interval = interval
+        self.threshold = threshold
+        self.max_lag = 0.0
+        self.stalls = 0
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def _run(self):
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            lag = time.perf_counter() - start - self.interval
+            self.max_lag = max(self.max_lag, lag)
+            if lag > self.threshold:
+                self.stalls += 1
+                log.warning(f"Event-Loop war {lag * 1000:.0f} ms blockiert")
+
+    def stop(self):
+        if self._task:
+            self._task.cancel()
+            self._task = None
@@ -0,0 +1,164 @@
+"""
+Arbeits-Warteschlange - priorisierte Discord-Aufrufe mit Routen-Limits und 429-Backoff.
+"""
+
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from collections import deque
+from typing import Awaitable, Callable, Deque, Dict, List, Optional
+
+import discord
+
+log = logging.getLogger("red.lfbbottickettool")
+
+# Prioritätsklassen, kleinere Zahl zuerst
+PRIO_CREATE = 0
+PRIO_CLOSE = 1
+PRIO_NOTIFY = 2
+PRIORITY_NAMES = {PRIO_CREATE: "Erstellung", PRIO_CLOSE: "Schließen/Löschen", PRIO_NOTIFY: "DMs/Logs"}
+
+# Gleichzeitige Aufrufe pro Route, nicht aufgeführte Routen nutzen DEFAULT_ROUTE_LIMIT
+ROUTE_LIMITS = {"channel_create": 2, "channel_edit": 2, "channel_delete": 2, "permissions": 3, "dm": 2, "log": 1}
+DEFAULT_ROUTE_LIMIT = 2
+WORKERS = 6
+MAX_RETRIES = 5
+WAIT_SAMPLES = 200
+
+Factory = Callable[[], Awaitable]
+
+
+class _Job:
+    __slots__ = ("priority", "seq", "route", "factory", "future", "queued")
+
+    def __init__(self, priority: int, seq: int, route: str, factory: Factory, future: asyncio.Future):
+        self.priority = priority
+        self.seq = seq
+        self.route = route
+        self.factory = factory
+        self.future = future
+        self.queued = time.monotonic()
+
+    def __lt__(self, other: "_Job") -> bool:
+        return (self.priority, self.seq) < (other.priority, other.seq)
+
+
+class _Route:
+    __slots__ = ("limit", "active", "parked", "retries")
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.active = 0
+        self.parked: List[_Job] = []
+        self.retries = 0
+
+
+class WorkScheduler:
+    """Führt Aufrufe nach Priorität aus, höchstens ``ROUTE_LIMITS[route]`` gleichzeitig pro Route.
+
+    Ist eine Route ausgelastet, wird der Auftrag dort geparkt und beim Freiwerden
+    eines Platzes wieder eingereiht. Bei 429 wird mit ``retry_after`` bzw. wachsender
+    Pause wiederholt, die Route bleibt währenddessen belegt.
+    """
+
+    def __init__(self, workers: int = WORKERS):
+        self._queue: Optional[asyncio.PriorityQueue] = None
+        self._n_workers = workers
+        self._workers: List[asyncio.Task] = []
+        self._seq = itertools.count()
+        self._routes: Dict[str, _Route] = {}
+        self.pending: Dict[int, int] = {p: 0 for p in PRIORITY_NAMES}
+        self.done: Dict[int, int] = {p: 0 for p in PRIORITY_NAMES}
+        self.waits: Dict[int, Deque[float]] = {p: deque(maxlen=WAIT_SAMPLES) for p in PRIORITY_NAMES}
+
+    def _route(self, name: str) -> _Route:
+        r = self._routes.get(name)
+        if r is None:
+            r = self._routes[name] = _Route(ROUTE_LIMITS.get(name, DEFAULT_ROUTE_LIMIT))
+        return r
+
+    def _start(self):
+        self._queue = asyncio.PriorityQueue()
+        self._workers = [asyncio.create_task(self._worker()) for _ in range(self._n_workers)]
+
+    def submit(self, priority: int, route: str, factory: Factory) -> asyncio.Future:
+        """Reiht ``factory()`` ein, das Future liefert dessen Ergebnis oder Fehler."""
+        if self._queue is None:
+            self._start()
+        future = asyncio.get_running_loop().create_future()
+        self.pending[priority] += 1
+        self._queue.put_nowait(_Job(priority, next(self._seq), route, factory, future))
+        return future
+
+    async def run(self, priority: int, route: str, factory: Factory):
+        return await self.submit(priority, route, factory)
+
+    def post(self, priority: int, route: str, factory: Factory):
+        """Wie ``submit``, aber ohne auf das Ergebnis zu warten, Fehler werden nur geloggt."""
+        self.submit(priority, route, factory).add_done_callback(self._log_failure)
+
+    @staticmethod
+    def _log_failure(future: asyncio.Future):
+        if not future.cancelled() and future.exception():
+            log.warning(f"Hintergrundauftrag fehlgeschlagen: {future.exception()}")
+
+    async def _worker(self):
+        while True:
+            job = await self._queue.get()
+            r = self._route(job.route)
+            if r.active >= r.limit:
+                heapq.heappush(r.parked, job)
+                continue
+            r.active += 1
+            try:
+                await self._execute(job, r)
+            finally:
+                r.active -= 1
+                if r.parked:
+                    self._queue.put_nowait(heapq.heappop(r.parked))
+
+    async def _execute(self, job: _Job, r: _Route):
+        self.pending[job.priority] -= 1
+        self.waits[job.priority].append(time.monotonic() - job.queued)
+        delay = 1.0
+        try:
+            for attempt in range(MAX_RETRIES):
+                if job.future.cancelled():
+                    return
+                try:
+                    result = await job.factory()
+                except discord.HTTPException as e:
+                    if e.status != 429 or attempt == MAX_RETRIES - 1:
+                        raise
+                    r.retries += 1
+                    await asyncio.sleep(getattr(e, "retry_after", None) or delay)
+                    delay = min(delay * 2, 60)
+                    continue
+                if not job.future.done():
+                    job.future.set_result(result)
+                return
+        except Exception as e:
+            if not job.future.done():
+                job.future.set_exception(e)
+        finally:
+            self.done[job.priority] += 1
+
+    def routes(self) -> Dict[str, tuple]:
+        """Route -> (aktiv, Limit, geparkt, 429-Wiederholungen)"""
+        return {name: (r.active, r.limit, len(r.parked), r.retries) for name, r in self._routes.items()}
+
+    async def close(self):
+        for t in self._workers:
+            t.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        waiting = [job for r in self._routes.values() for job in r.parked]
+        for r in self._routes.values():
+            r.parked.clear()
+        while self._queue is not None and not self._queue.empty():
+            waiting.append(self._queue.get_nowait())
+        for job in waiting:
+            job.future.cancel()
+        self._workers = []
+        self._queue = None
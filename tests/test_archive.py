@@ -0,0 +1,42 @@
+import datetime
+import importlib
+import sys
+import types
+from pathlib import Path
+
+import pytest
+
+# Die reinen Module ohne das Paket-__init__ laden, das den Cog samt Red importiert
+_pkg = types.ModuleType("_lfb_pure")
+_pkg.__path__ = [str(Path(__file__).resolve().parents[1] / "LFBBotTicketTool")]
+sys.modules.setdefault("_lfb_pure", _pkg)
+archive = importlib.import_module("_lfb_pure.archive")
+closed_ts, segment_name, select_expired = archive.closed_ts, archive.segment_name, archive.select_expired
+
+DAY = 86400
+NOW = 1_700_000_000.0
+
+
+def test_closed_ticket_without_closed_at_is_archived():
+    legacy = {"channel_id": 1, "status": "closed", "created_at": datetime.datetime.fromtimestamp(NOW - 90 * DAY).isoformat()}
+    assert select_expired([legacy], NOW - 30 * DAY) == [legacy]
+    assert closed_ts(legacy) == pytest.approx(NOW - 90 * DAY)
+
+
+def test_last_activity_wins_over_creation():
+    t = {"channel_id": 2, "status": "closed", "created_ts": NOW - 90 * DAY, "last_activity": NOW - 5 * DAY}
+    assert select_expired([t], NOW - 30 * DAY) == []
+
+
+def test_open_and_recent_tickets_are_kept():
+    tickets = [
+        {"channel_id": 3, "status": "open", "created_ts": NOW - 90 * DAY},
+        {"channel_id": 4, "status": "closed", "closed_at": NOW - DAY},
+        {"channel_id": 5, "status": "closed"},
+    ]
+    assert select_expired(tickets, NOW - 30 * DAY) == []
+
+
+def test_segment_uses_fallback_timestamp():
+    t = {"status": "closed", "created_ts": datetime.datetime(2023, 4, 15, tzinfo=datetime.timezone.utc).timestamp()}
+    assert segment_name(t) == "2023-04"